@@ -7,18 +7,28 @@ import json
 import os
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import mysql.connector
 import requests
-from jinja2 import Environment, FileSystemLoader
-from collections import defaultdict
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from collections import Counter, defaultdict
+from itertools import groupby
+from html import escape
+
+from analysis.summarization import map_reduce_summary
+from database.connection import get_connection
+from database.queries import stream_rows
+from utils.disk_cache import DiskCache, make_key
+from utils.highlight import highlight_rows
+from utils.static_output import prune_snapshots, remove_stale_shards, write_atomic, write_shards
+from utils.keywords import BOT_KEYWORDS, TOPIC_MATCHER
 
 # ─── load config ──────────────────────────────────────────────────────────────
 with open('config.json') as f:
     cfg = json.load(f)
 
 DB_CFG        = cfg['db_config']
-FORUMS_CFG    = {f['name']:f for f in cfg['forums']}
+FORUMS_CFG    = {f.get('name') or f['forum_name']: f for f in cfg['forums']}
 DS_API_KEY    = cfg['deepseek_api_key']
 SUM_CFG       = cfg['summarizer']
 REPORT_CFG    = cfg['report']
@@ -29,26 +39,56 @@ DS_MODEL      = SUM_CFG['model']
 DS_MAX_TOKENS = SUM_CFG['max_tokens']
 DS_BATCH      = SUM_CFG['batch_size']
 DS_DELAY      = SUM_CFG['delay_seconds']
+DS_CACHE_CFG  = SUM_CFG.get('cache', {})
+DS_RPS        = SUM_CFG.get('requests_per_second') or (1.0 / DS_DELAY if DS_DELAY else 1.0)
+DS_WORKERS    = SUM_CFG.get('max_concurrency', 4)
+
+# On-disk cache of DeepSeek responses keyed by the full request, so an unchanged
+# report costs no tokens. Set summarizer.cache.enabled = false to always call the API.
+LLM_CACHE = DiskCache(
+    DS_CACHE_CFG.get('dir', 'cache/llm'),
+    ttl=DS_CACHE_CFG.get('ttl_hours', 168) * 3600,
+    max_bytes=DS_CACHE_CFG.get('max_mb', 50) * 1024 * 1024,
+) if DS_CACHE_CFG.get('enabled', True) else None
 
-# Define bot-related keywords
-BOT_KEYWORDS = [
-    "bot", "bots", "botting", "automated", "automation",
-    "cheat", "cheats", "cheating", "cheater", "cheaters",
-    "collu", "collusion", "colluder", "colluders",
-    "security", "secure", "hack", "hacks", "hacking", "hacker",
-    "exploit", "exploiting", "exploiter", "vulnerability"
-]
+# Rendered embed cards keyed by content_hash: posts never change after insert, so only
+# new rows are rendered. Bump EMBED_VERSION whenever embed_card's markup changes.
+EMBED_VERSION   = 1
+EMBED_CACHE_CFG = REPORT_CFG.get('embed_cache', {})
+EMBED_CACHE = DiskCache(
+    EMBED_CACHE_CFG.get('dir', 'cache/embeds'),
+    max_bytes=EMBED_CACHE_CFG.get('max_mb', 100) * 1024 * 1024,
+    prune_on_set=False,
+) if EMBED_CACHE_CFG.get('enabled', True) else None
 
 # ─── db connection ────────────────────────────────────────────────────────────
 def get_db_conn():
+    """
+    Borrow a health-checked connection from the shared 'report' pool (database.connection,
+    sized by db_pool); conn.close() hands it back. Report sections run concurrently and share it.
+    """
     try:
-        conn = mysql.connector.connect(**DB_CFG)
+        conn = get_connection('report')
         print(f"✅ Database connection successful")
         return conn
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
         return None
 
+# ─── link to the original post ────────────────────────────────────────────────
+def build_post_url(r):
+    """Return the public URL for a stored mention (tweet, Reddit post or forum anchor)"""
+    if r['source'] == 'X' and r.get('tweet_id'):
+        return f"https://twitter.com/i/web/status/{r['tweet_id']}"
+    if r['source'] == 'Reddit' and r.get('external_id'):
+        return f"https://www.reddit.com/comments/{r['external_id']}"
+    frm = FORUMS_CFG.get(r['source_detail'])
+    if frm:
+        # link to first page of thread plus anchor
+        url = frm['base_url'].format(frm['start_page'])
+        return f"{url}#{r['external_id']}"
+    return ''
+
 # ─── fetch all sources first ────────────────────────────────────────────────────
 def fetch_sources():
     """Fetch all unique sources in the database"""
@@ -75,112 +115,75 @@ def fetch_sources():
     print(f"Found {len(sources)} unique sources")
     return sources
 
-# Helper function to create exact word matching conditions
-def create_word_boundary_conditions(keyword):
-    """Create SQL conditions that match exact words, not partial words"""
-    try:
-        safe_keyword = keyword.replace("'", "''")
-        
-        # For exact word matching, we need to consider the context
-        conditions = [
-            f" {safe_keyword} ",     # Surrounded by spaces
-            f" {safe_keyword},",     # Word followed by comma with space before  
-            f" {safe_keyword}.",     # Word followed by period with space before
-            f" {safe_keyword}!",     # Word followed by exclamation with space before
-            f" {safe_keyword}?",     # Word followed by question mark with space before
-            f" {safe_keyword}:",     # Word followed by colon with space before
-            f" {safe_keyword};",     # Word followed by semicolon with space before
-            f" {safe_keyword})",     # Word followed by closing parenthesis with space before
-            f"({safe_keyword} ",     # Word preceded by opening parenthesis with space after
-            f"\n{safe_keyword} ",    # Word at start of line with space after
-            f" {safe_keyword}\n",    # Word at end of line with space before
-            f"^{safe_keyword} ",     # Word at start of content with space after
-            f" {safe_keyword}$",     # Word at end of content with space before
-        ]
-        
-        # Create LIKE conditions for each pattern
-        like_conditions = []
-        for pattern in conditions:
-            like_conditions.append(f"content LIKE '%{pattern}%'")
-        
-        # For exact matches (when the word is alone)
-        like_conditions.append(f"content = '{safe_keyword}'")
-        
-        return like_conditions
-    except Exception as e:
-        print(f"❌ Error in create_word_boundary_conditions: {e}")
-        # Fallback to simpler condition if there's an error
-        return [f"content LIKE '%{keyword}%'"]
-
 # ─── fetch top mentions for each source ────────────────────────────────────────
 def fetch_rows(limit_per_source=10):
-    """Fetch top mentions from each source (most recent)"""
+    """
+    Fetch the N most recent mentions of every (source, source_detail) in one query.
+    ROW_NUMBER() ranks posts within each source using idx_source_detail_date, and only
+    the columns the report needs are returned. The source list is derived from the result.
+    """
     print(f"Fetching up to {limit_per_source} recent mentions per source...")
-    sources = fetch_sources()
-    all_rows = []
     
     conn = get_db_conn()
     if not conn:
         print(f"⚠️ No database connection, returning empty rows list")
-        return [], sources, limit_per_source
+        return [], [], limit_per_source
         
     cur = conn.cursor(dictionary=True)
     
-    # For each source, get the top N most recent posts
-    for source_info in sources:
-        source = source_info['source']
-        source_detail = source_info['source_detail']
-        
-        # Build query parameters - DON'T filter by date initially
-        query_params = []
-        query = """
-            SELECT * 
+    query = """
+        SELECT id, source, source_detail, external_id, tweet_id, username, post_date, content_hash
+        FROM (
+            SELECT 
+                id, source, source_detail, external_id, tweet_id, username, post_date, content_hash,
+                ROW_NUMBER() OVER (PARTITION BY source, source_detail ORDER BY post_date DESC) AS rn
             FROM external_mentions
-            WHERE 1=1
-        """
-        
-        # Add source filters
-        if source:
-            query += " AND source = %s"
-            query_params.append(source)
-            
-        if source_detail:
-            query += " AND source_detail = %s"
-            query_params.append(source_detail)
-            
-        query += " ORDER BY post_date DESC LIMIT %s"
-        query_params.append(limit_per_source)
-        
-        try:
-            cur.execute(query, query_params)
-            source_rows = cur.fetchall()
-            print(f"- Found {len(source_rows)} rows for source {source}, {source_detail}")
-            all_rows.extend(source_rows)
-        except Exception as e:
-            print(f"Error fetching rows for source {source}, {source_detail}: {e}")
+        ) ranked
+        WHERE rn <= %s
+        ORDER BY source, source_detail, post_date DESC
+    """
+    
+    try:
+        cur.execute(query, (limit_per_source,))
+        all_rows = cur.fetchall()
+    except Exception as e:
+        print(f"Error fetching rows per source: {e}")
+        all_rows = []
     
     cur.close()
     conn.close()
     
+    # Distinct sources in (source, source_detail) order, same shape as fetch_sources()
+    sources = []
+    seen = set()
+    for r in all_rows:
+        key = (r['source'], r['source_detail'])
+        if key not in seen:
+            seen.add(key)
+            sources.append({'source': r['source'], 'source_detail': r['source_detail']})
+    print(f"Found {len(sources)} unique sources")
+    
     # Build URLs for each row - UPDATED TO INCLUDE REDDIT
     for r in all_rows:
-        if r['source'] == 'X' and r['tweet_id']:
-            r['url'] = f"https://twitter.com/i/web/status/{r['tweet_id']}"
-        elif r['source'] == 'Reddit' and r['external_id']:
-            r['url'] = f"https://www.reddit.com/comments/{r['external_id']}"
-        else:
-            frm = FORUMS_CFG.get(r['source_detail'])
-            if frm:
-                # link to first page of thread plus anchor
-                url = frm['base_url'].format(frm['start_page'])
-                r['url'] = f"{url}#{r['external_id']}"
-            else:
-                r['url'] = ''
+        r['url'] = build_post_url(r)
     
     print(f"Total rows fetched: {len(all_rows)}")
     return all_rows, sources, limit_per_source
 
 # ─── fetch bot mentions history with enhanced logging ────────────────────────────
+def rollup_covers(cur, start_str):
+    """
+    True when mention_rollup reaches back to the first post in the window. A rollup
+    only filled since it was deployed would otherwise silently cut the chart short.
+    """
+    cur.execute("SELECT MIN(bucket) AS first FROM mention_rollup")
+    rollup_first = cur.fetchone()['first']
+    cur.execute(f"SELECT MIN(post_date) AS first FROM external_mentions WHERE post_date >= '{start_str}'")
+    posts_first = cur.fetchone()['first']
+    if posts_first is None:
+        return True
+    return rollup_first is not None and str(rollup_first)[:10] <= str(posts_first)[:10]
+
 def fetch_bot_mentions(months=12):
     """Fetch bot mentions history for the last N months with detailed logging"""
     print(f"Fetching bot mentions for the last {months} months")
@@ -202,103 +205,87 @@ def fetch_bot_mentions(months=12):
             
         cur = conn.cursor(dictionary=True)
         
-        # Use a much simpler approach without parameterized queries
-        bot_mentions_by_source = []
-        total_by_source = []
+        by_source = []
         
-        # For each keyword, fetch counts separately
-        for keyword in BOT_KEYWORDS:
-            # Get word boundary conditions for exact matching
-            like_conditions = create_word_boundary_conditions(keyword)
-            
-            # Combine all conditions with OR
-            like_clause = " OR ".join(like_conditions)
-            
-            bot_query = f"""
+        # Preferred path: the daily mention_rollup kept up to date at insert time
+        # (see database/rollup.py), so this reads O(days × sources) rows
+        if REPORT_CFG.get('use_rollup', True):
+            rollup_query = f"""
+                SELECT 
+                    DATE_FORMAT(bucket, '%Y-%m') as month,
+                    source,
+                    SUM(CASE WHEN category = 'bot' THEN mentions ELSE 0 END) as count,
+                    SUM(CASE WHEN category = 'total' THEN mentions ELSE 0 END) as total
+                FROM 
+                    mention_rollup
+                WHERE 
+                    bucket BETWEEN DATE('{start_str}') AND DATE('{end_str}')
+                    AND category IN ('bot', 'total')
+                GROUP BY 
+                    DATE_FORMAT(bucket, '%Y-%m'), source
+                ORDER BY 
+                    month ASC, source
+            """
+            try:
+                if rollup_covers(cur, start_str):
+                    cur.execute(rollup_query)
+                    by_source = cur.fetchall()
+                    print(f"Found {len(by_source)} month/source combinations in mention_rollup")
+                else:
+                    print("⚠️ mention_rollup starts after the requested window "
+                          "(run `python -m database.backfill rollup`), scanning external_mentions")
+            except Exception as e:
+                print(f"⚠️ mention_rollup unavailable ({e}), scanning external_mentions")
+        
+        # Fallback: one scan computes both numbers per month/source: `count` is the number
+        # of distinct posts matching any bot keyword (a post hitting "bot" and "bots" counts
+        # once) and `total` is all posts, so the cost no longer scales with keywords
+        if not by_source:
+            query = f"""
                 SELECT 
                     DATE_FORMAT(post_date, '%Y-%m') as month,
                     source,
-                    COUNT(*) as count
+                    SUM(keyword_flags > 0) as count,
+                    COUNT(*) as total
                 FROM 
                     external_mentions
                 WHERE 
                     post_date BETWEEN '{start_str}' AND '{end_str}'
-                    AND ({like_clause})
                 GROUP BY 
                     DATE_FORMAT(post_date, '%Y-%m'), source
+                ORDER BY 
+                    month ASC, source
             """
             
             try:
-                cur.execute(bot_query)
-                results = cur.fetchall()
-                print(f"Found {len(results)} results for keyword '{keyword}'")
-                for row in results:
-                    bot_mentions_by_source.append(row)
+                cur.execute(query)
+                by_source = cur.fetchall()
+                print(f"Found {len(by_source)} month/source combinations")
             except Exception as e:
-                print(f"Error executing query for keyword '{keyword}': {e}")
-        
-        # Get total mentions by month for comparison
-        total_query = f"""
-            SELECT 
-                DATE_FORMAT(post_date, '%Y-%m') as month,
-                source,
-                COUNT(*) as count
-            FROM 
-                external_mentions
-            WHERE 
-                post_date BETWEEN '{start_str}' AND '{end_str}'
-            GROUP BY 
-                DATE_FORMAT(post_date, '%Y-%m'), source
-            ORDER BY 
-                month ASC, source
-        """
-        
-        try:
-            cur.execute(total_query)
-            total_by_source = cur.fetchall()
-            print(f"Found {len(total_by_source)} total month/source combinations")
-        except Exception as e:
-            print(f"Error executing total query: {e}")
+                print(f"Error executing bot mentions query: {e}")
+                by_source = []
         
         cur.close()
         conn.close()
         
-        # Combine counts by month and source to remove duplicates from multiple keywords
-        combined_counts = {}
-        for row in bot_mentions_by_source:
-            month = row['month']
-            source = row['source']
-            count = row['count']
-            
-            key = f"{month}:{source}"
-            if key not in combined_counts:
-                combined_counts[key] = {
-                    'month': month,
-                    'source': source,
-                    'count': 0
-                }
-            combined_counts[key]['count'] += count
-        
-        # Convert to list
-        combined_bot_mentions = list(combined_counts.values())
-        print(f"After combining: {len(combined_bot_mentions)} unique month/source combinations with keywords")
-        
-        # Create a lookup for total counts
-        total_lookup = {}
-        for row in total_by_source:
-            month = row['month']
-            source = row['source']
-            count = row['count']
-            if month not in total_lookup:
-                total_lookup[month] = {}
-            total_lookup[month][source] = count
+        return summarize_bot_mentions(by_source)
         
-        # Group by month to combine all sources
+    except Exception as e:
+        print(f"❌ Critical error in fetch_bot_mentions: {e}")
+        print("Returning empty list")
+        return []  # Return empty list on any unexpected error
+
+def summarize_bot_mentions(by_source):
+    """Turn (month, source, count, total) rows into the per-month structure used by the report"""
+    try:
+        # Group by month to combine all sources; only month/sources with mentions are kept
         combined_data = {}
-        for row in combined_bot_mentions:
+        for row in by_source:
             month = row['month']
             source = row['source']
-            count = row['count']
+            count = int(row['count'] or 0)
+            if not count:
+                continue
             
             if month not in combined_data:
                 combined_data[month] = {
@@ -309,12 +296,10 @@ def fetch_bot_mentions(months=12):
                     'combined_total': 0
                 }
             
-            combined_data[month]['counts'][source] = count
+            source_total = int(row['total'] or 0)
+            combined_data[month]['counts'][source] += count
             combined_data[month]['combined_count'] += count
-            
-            # Add total count for this source/month
-            source_total = total_lookup.get(month, {}).get(source, 0)
-            combined_data[month]['totals'][source] = source_total
+            combined_data[month]['totals'][source] += source_total
             combined_data[month]['combined_total'] += source_total
         
         # Convert to list and calculate percentages
@@ -360,87 +345,80 @@ def fetch_bot_mentions(months=12):
         return result
         
     except Exception as e:
-        print(f"❌ Critical error in fetch_bot_mentions: {e}")
-        print("Returning empty list")
-        return []  # Return empty list on any unexpected error
+        print(f"❌ Error in summarize_bot_mentions: {e}")
+        return []
 
 # ─── fetch recent bot-related posts with enhanced error handling ────────────────
-def fetch_bot_related_posts(limit=50):
-    """Fetch recent posts that contain bot-related keywords with better error handling"""
-    print(f"Fetching up to {limit} recent bot-related posts...")
+def fulltext_query(keywords):
+    """Build a MySQL BOOLEAN MODE expression matching any of the keywords as whole words/phrases"""
+    terms = []
+    for kw in keywords:
+        kw = kw.replace('"', ' ').strip()
+        if kw:
+            terms.append(f'"{kw}"')
+    return " ".join(terms)
+
+def fetch_bot_related_posts(limit=50, keywords=None, since=None):
+    """
+    Fetch the most recent posts that contain bot-related keywords, newest first:
+    at most `limit` (None for no cap) and, if `since` is given, only posts from then on.
+    With the default keyword list this filters on the ingest-time keyword_flags;
+    an ad-hoc `keywords` list goes through the FULLTEXT index on content instead.
+    Either way it is one indexed query.
+    """
+    print(f"Fetching {'all' if limit is None else f'up to {limit}'} recent bot-related posts"
+          f"{f' since {since}' if since else ''}...")
     
     try:
         conn = get_db_conn()
         if not conn:
             print(f"⚠️ No database connection, returning empty list")
             return []
-            
-        cur = conn.cursor(dictionary=True)
         
-        # Use a union query approach to avoid complex OR conditions
-        all_rows = []
-        
-        # Query for each keyword separately and combine results
-        for keyword in BOT_KEYWORDS:
-            # Get word boundary conditions for exact matching
-            like_conditions = create_word_boundary_conditions(keyword)
-            
-            # Combine all conditions with OR
-            like_clause = " OR ".join(like_conditions)
-            
-            query = f"""
+        if keywords is None:
+            # keyword_flags is set at ingest (see utils/cleaning.keyword_flags), so any
+            # bot keyword is a single integer predicate served by idx_post_date_flags
+            query = """
                 SELECT *
                 FROM external_mentions
-                WHERE ({like_clause})
-                ORDER BY post_date DESC
-                LIMIT {limit}
+                WHERE keyword_flags > 0
             """
-            
-            try:
-                cur.execute(query)
-                rows = cur.fetchall()
-                print(f"- Found {len(rows)} posts containing '{keyword}'")
-                all_rows.extend(rows)
-            except Exception as e:
-                print(f"Error fetching posts for keyword '{keyword}': {e}")
-                # Continue with other keywords even if one fails
+            params = []
+        else:
+            query = """
+                SELECT *
+                FROM external_mentions
+                WHERE MATCH(content) AGAINST (%s IN BOOLEAN MODE)
+            """
+            params = [fulltext_query(keywords)]
+        if since is not None:
+            query += " AND post_date >= %s"
+            params.append(since)
+        query += " ORDER BY post_date DESC"
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
+        
+        # Streamed in chunks: with no LIMIT (a whole week, see fetch_week_bot_posts) the
+        # result can be large, and only the finished row dicts are kept, not a second
+        # buffered copy of the result set
+        result_rows = []
+        try:
+            for r in stream_rows(conn, query, params):
+                r['url'] = build_post_url(r)
+                result_rows.append(r)
+        except Exception as e:
+            print(f"Error fetching bot-related posts: {e}")
+            result_rows = []
         
-        cur.close()
         conn.close()
         
         # Check if we have any results
-        if not all_rows:
-            print("⚠️ No results found for any keywords, returning empty list")
+        if not result_rows:
+            print("⚠️ No bot-related posts found, returning empty list")
             return []
         
-        # Remove duplicates based on unique ID
-        unique_rows = {}
-        for row in all_rows:
-            if 'id' in row and row['id'] not in unique_rows:
-                unique_rows[row['id']] = row
-        
-        # Convert back to list and sort by date
-        result_rows = list(unique_rows.values())
-        result_rows.sort(key=lambda x: x['post_date'], reverse=True)
-        
-        # Limit to the requested number
-        result_rows = result_rows[:limit]
-        
-        # Build URLs for each row - UPDATED TO INCLUDE REDDIT
-        for r in result_rows:
-            if r['source'] == 'X' and r['tweet_id']:
-                r['url'] = f"https://twitter.com/i/web/status/{r['tweet_id']}"
-            elif r['source'] == 'Reddit' and r['external_id']:
-                r['url'] = f"https://www.reddit.com/comments/{r['external_id']}"
-            else:
-                frm = FORUMS_CFG.get(r['source_detail'])
-                if frm:
-                    url = frm['base_url'].format(frm['start_page'])
-                    r['url'] = f"{url}#{r['external_id']}"
-                else:
-                    r['url'] = ''
-        
-        print(f"After removing duplicates: {len(result_rows)} unique bot-related posts")
+        print(f"Found {len(result_rows)} bot-related posts")
         return result_rows  # Always return the list, even if empty
         
     except Exception as e:
@@ -448,6 +426,23 @@ def fetch_bot_related_posts(limit=50):
         print("Returning empty list")
         return []  # Return empty list on any unexpected error
 
+def fetch_week_bot_posts(days=7, minimum=50):
+    """
+    Every bot-related post from the last `days` days, so the overview covers the whole
+    week however busy it was. A quieter week falls back to the newest `minimum` posts.
+    """
+    since = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+    rows = fetch_bot_related_posts(limit=None, since=since)
+    if len(rows) < minimum:
+        rows = fetch_bot_related_posts(minimum)
+    return rows
+
+def search_posts(keywords, limit=50):
+    """Ad-hoc keyword search for the report layer, newest first (FULLTEXT index)"""
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    return fetch_bot_related_posts(limit=limit, keywords=keywords)
+
 # ─── generate critical mentions section ─────────────────────────────────────
 def generate_critical_mentions_section(valid_rows):
     """Generate the Top 3 Critical Mentions section with proper links"""
@@ -561,8 +556,9 @@ def summarize_for_overview(rows, bot_rows):
     print(f"Generating summary from {len(bot_rows)} bot-related posts...")
     
     try:
-        # Filter down to just the bot-related rows
-        valid_rows = bot_rows[:20]  # Limit to 20 for summarization
+        # All bot-related rows are summarized; beyond DS_BATCH rows the AI summary
+        # switches to batched map-reduce (see generate_ai_summary)
+        valid_rows = bot_rows
         
         # If we have too few valid rows, just return a simple message
         if len(valid_rows) < 5:
@@ -582,27 +578,11 @@ def summarize_for_overview(rows, bot_rows):
             source = r['source_detail'] or r['source']
             week_lines.append(f"- [{source}] {content}")
         
-        # Count topics for frequency analysis
+        # Count topics for frequency analysis (one matcher pass per row, see utils/keywords.TOPICS)
         bot_topics = defaultdict(int)
-        
-        # Define more specific bot-related topic patterns
-        topics = {
-            "bots": r"bot|automated|automation",
-            "cheating": r"cheat|exploit",
-            "collusion": r"collu",
-            "security": r"security|secure|hack|vulnerability",
-            "gambling": r"gamble|gambling|wager",
-            "tournaments": r"tournament|event|venom|mtt|game",
-            "financial": r"deposit|money|fund|payment|dollar|\$",
-            "accounts": r"account|login|password|username"
-        }
-        
-        # Count occurrences by topic
         for r in valid_rows:
-            content = r['content'].lower()
-            for topic, pattern in topics.items():
-                if re.search(pattern, content):
-                    bot_topics[topic] += 1
+            for topic in TOPIC_MATCHER.matched_groups(r['content']):
+                bot_topics[topic] += 1
         
         # Get source distribution
         source_counts = defaultdict(int)
@@ -631,10 +611,50 @@ def summarize_for_overview(rows, bot_rows):
         <p>An error occurred while generating the summary. Please check the individual mentions below.</p>
         """
 
+# ─── DeepSeek chat completion with response cache ───────────────────────────
+def call_deepseek(msgs, max_tokens):
+    """Return the completion text for `msgs`, served from LLM_CACHE when the same request was made before"""
+    key = make_key(DS_MODEL, max_tokens, msgs)
+    if LLM_CACHE is not None:
+        cached = LLM_CACHE.get(key)
+        if cached is not None:
+            print(f"♻️ Using cached DeepSeek response ({key[:12]})")
+            return cached
+    
+    resp = requests.post(
+        'https://api.deepseek.com/chat/completions',
+        headers={"Authorization": f"Bearer {DS_API_KEY}"},
+        json={"model": DS_MODEL, "messages": msgs, "max_tokens": max_tokens},
+        timeout=60  # Add timeout to avoid hanging requests
+    ).json()
+    
+    content = resp['choices'][0]['message']['content'].strip()
+    if LLM_CACHE is not None:
+        LLM_CACHE.set(key, content)
+    return content
+
 # ─── generate AI-powered summary ─────────────────────────────────────────────
-def generate_ai_summary(source_info, topic_info, week_lines, valid_rows):
-    """Generate a summary using the DeepSeek API"""
-    msgs = [
+def batch_summary_messages(label, rows):
+    """Prompt for one map step: a short factual digest of a batch of posts from one source"""
+    lines = []
+    for r in rows:
+        content = r['content']
+        if len(content) > 300:
+            content = content[:297] + "..."
+        lines.append(f"- {content}")
+    return [
+        {"role": "system", "content": SYS_PROMPT},
+        {"role": "user", "content": f"""Summarize these {len(rows)} bot/security-related posts from {label} in 3-5 factual bullet points.
+Mention recurring complaints and specific numbers. Do not speculate.
+
+POSTS:
+{chr(10).join(lines)}
+"""}
+    ]
+
+def overview_messages(source_info, topic_info, content_heading, content):
+    """Prompt for the weekly overview; `content` is either sample posts or batch summaries"""
+    return [
         {"role": "system", "content": SYS_PROMPT_W},
         {"role": "user", "content": f"""Provide a balanced summary focused on bot and security-related mentions in social media.
 Start with neutral observations before any potential concerns.
@@ -645,8 +665,8 @@ SOURCE DISTRIBUTION:
 TOP TOPICS BY FREQUENCY:
 {topic_info}
 
-SAMPLE CONTENT:
-{chr(10).join(week_lines[:10])}
+{content_heading}:
+{content}
 
 Please return a HTML-formatted report with:
 1. A factual overview of bot-related mentions across platforms
@@ -655,15 +675,31 @@ Please return a HTML-formatted report with:
 4. DO NOT speculate about actual security issues, just report what was mentioned
 """}
     ]
-    
-    resp = requests.post(
-        'https://api.deepseek.com/chat/completions',
-        headers={"Authorization": f"Bearer {DS_API_KEY}"},
-        json={"model": DS_MODEL, "messages": msgs, "max_tokens": MAX_TOK_WEEK},
-        timeout=60  # Add timeout to avoid hanging requests
-    ).json()
-    
-    overview = resp['choices'][0]['message']['content'].strip()
+
+def generate_ai_summary(source_info, topic_info, week_lines, valid_rows):
+    """
+    Generate a summary using the DeepSeek API. Up to DS_BATCH rows all go into a single
+    prompt; larger sets are summarized per source in batches of DS_BATCH (in parallel,
+    limited to DS_RPS requests/s) and the batch summaries reduced into the overview.
+    """
+    if len(valid_rows) <= DS_BATCH:
+        msgs = overview_messages(source_info, topic_info, "POSTS", chr(10).join(week_lines))
+        overview = call_deepseek(msgs, MAX_TOK_WEEK)
+    else:
+        overview, partials = map_reduce_summary(
+            valid_rows,
+            complete=lambda msgs: call_deepseek(msgs, DS_MAX_TOKENS),
+            batch_messages=batch_summary_messages,
+            reduce_messages=lambda partials: overview_messages(
+                source_info, topic_info, "BATCH SUMMARIES",
+                "\n\n".join(f"[{label}]\n{text}" for label, text in partials)
+            ),
+            batch_size=DS_BATCH,
+            requests_per_second=DS_RPS,
+            max_workers=DS_WORKERS,
+            reduce_complete=lambda msgs: call_deepseek(msgs, MAX_TOK_WEEK),
+        )
+        print(f"Reduced {len(partials)} batch summaries covering {len(valid_rows)} posts")
     
     # Clean up the overview response
     overview = clean_markdown_response(overview)
@@ -727,9 +763,10 @@ def generate_manual_summary(source_info, topic_info, valid_rows):
         top_topics_text = ", ".join(top_topics[:3])
         
         # Count total mentions by category
-        bot_count = sum(1 for r in valid_rows if re.search(r'bot|automated|automation', r['content'].lower()))
-        cheat_count = sum(1 for r in valid_rows if re.search(r'cheat|exploit', r['content'].lower()))
-        security_count = sum(1 for r in valid_rows if re.search(r'security|secure|hack|vulnerability', r['content'].lower()))
+        row_topics = [TOPIC_MATCHER.matched_groups(r['content']) for r in valid_rows]
+        bot_count = sum(1 for t in row_topics if 'bots' in t)
+        cheat_count = sum(1 for t in row_topics if 'cheating' in t)
+        security_count = sum(1 for t in row_topics if 'security' in t)
         
         # Generate a comprehensive weekly summary
         weekly_summary = f"""
@@ -767,82 +804,100 @@ def generate_manual_summary(source_info, topic_info, valid_rows):
         """
 
 # ─── Create embedded content cards with keyword highlighting ──────────────────
-def create_embeds_with_highlights(rows):
-    """Add embedded content HTML for each row with exact word highlighting"""
-    print(f"Creating embedded content with highlights for {len(rows)} rows...")
-    
-    try:
-        for r in rows:
-            # Create highlighted content by wrapping keywords in highlight span
-            highlighted_content = r['content']
-            
-            # Use word boundary regex for exact word matching
-            for keyword in BOT_KEYWORDS:
-                # This pattern matches whole words only
-                pattern = re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE)
-                highlighted_content = pattern.sub(f'<span class="highlight-bot">\\g<0></span>', highlighted_content)
-            
-            # Extract highlights for display above the content
-            matches = re.findall(r'<span class="highlight-bot">(.*?)</span>', highlighted_content)
-            unique_matches = list(set([m.lower() for m in matches]))
-            
-            highlight_html = ""
-            if unique_matches:
-                highlight_html = '<div class="highlight-container">'
-                for match in unique_matches[:5]:  # Limit to 5 highlights
-                    highlight_html += f'<span class="highlight-item">{match}</span>'
-                highlight_html += '</div>'
-            
-            if r['source'] == 'X':
-                # Create a Twitter-like card
-                r['highlighted_embed'] = f"""
+def embed_card(r, highlighted_content, unique_matches):
+    """Card HTML for one row; highlighted_content must already be HTML-escaped"""
+    highlight_html = ""
+    if unique_matches:
+        highlight_html = '<div class="highlight-container">'
+        for match in unique_matches[:5]:  # Limit to 5 highlights
+            highlight_html += f'<span class="highlight-item">{escape(match)}</span>'
+        highlight_html += '</div>'
+
+    post_date = r['post_date'].strftime('%b %d, %Y %H:%M')
+    url = escape(r['url'] or '#', quote=True)
+
+    if r['source'] == 'X':
+        # Create a Twitter-like card
+        return f"""
                 <div class="social-embed twitter-embed">
                     <div class="embed-header">
-                        <span class="source-name">@{r['source_detail'] or 'user'}</span>
-                        <span class="post-date">{r['post_date'].strftime('%b %d, %Y %H:%M')}</span>
+                        <span class="source-name">@{escape(r['source_detail'] or 'user')}</span>
+                        <span class="post-date">{post_date}</span>
                     </div>
                     {highlight_html}
                     <div class="embed-content">{highlighted_content}</div>
                     <div class="embed-footer">
-                        <a href="{r['url']}" target="_blank" class="view-link">View on Twitter</a>
+                        <a href="{url}" target="_blank" class="view-link">View on Twitter</a>
                     </div>
                 </div>
                 """
-            elif r['source'] == 'Reddit':
-                # Create a Reddit-like card
-                username = r.get('username', 'redditor')
-                r['highlighted_embed'] = f"""
+    elif r['source'] == 'Reddit':
+        # Create a Reddit-like card
+        username = r.get('username', 'redditor')
+        return f"""
                 <div class="social-embed reddit-embed">
                     <div class="embed-header">
-                        <span class="source-name">r/{r['source_detail'] or 'subreddit'}</span>
-                        <span class="user-name">u/{username}</span>
-                        <span class="post-date">{r['post_date'].strftime('%b %d, %Y %H:%M')}</span>
+                        <span class="source-name">r/{escape(r['source_detail'] or 'subreddit')}</span>
+                        <span class="user-name">u/{escape(str(username))}</span>
+                        <span class="post-date">{post_date}</span>
                     </div>
                     {highlight_html}
                     <div class="embed-content">{highlighted_content}</div>
                     <div class="embed-footer">
-                        <a href="{r['url']}" target="_blank" class="view-link">View on Reddit</a>
+                        <a href="{url}" target="_blank" class="view-link">View on Reddit</a>
                     </div>
                 </div>
                 """
-            else:
-                # Create a forum post card
-                forum_name = r['source_detail'] or r['source']
-                username = r.get('username', 'Anonymous')
-                r['highlighted_embed'] = f"""
+    else:
+        # Create a forum post card
+        forum_name = r['source_detail'] or r['source']
+        username = r.get('username', 'Anonymous')
+        return f"""
                 <div class="social-embed forum-embed">
                     <div class="embed-header">
-                        <span class="source-name">{forum_name}</span>
-                        <span class="user-name">{username}</span>
-                        <span class="post-date">{r['post_date'].strftime('%b %d, %Y %H:%M')}</span>
+                        <span class="source-name">{escape(forum_name)}</span>
+                        <span class="user-name">{escape(str(username))}</span>
+                        <span class="post-date">{post_date}</span>
                     </div>
                     {highlight_html}
                     <div class="embed-content">{highlighted_content}</div>
                     <div class="embed-footer">
-                        <a href="{r['url']}" target="_blank" class="view-link">View Original Post</a>
+                        <a href="{url}" target="_blank" class="view-link">View Original Post</a>
                     </div>
                 </div>
                 """
+
+def create_embeds_with_highlights(rows, prune=True):
+    """
+    Add embedded content HTML for each row with exact word highlighting.
+    prune=False skips trimming EMBED_CACHE, for callers that run this many times and prune once.
+    """
+    print(f"Creating embedded content with highlights for {len(rows)} rows...")
+    
+    try:
+        # Serve unchanged posts from EMBED_CACHE; the version folds in everything
+        # besides the row that shapes a card (markup, keyword list, forum URLs)
+        version = make_key(EMBED_VERSION, BOT_KEYWORDS, FORUMS_CFG)
+        pending = []
+        for r in rows:
+            key = None
+            if EMBED_CACHE is not None and r.get('content_hash'):
+                key = make_key(version, r['content_hash'], r['source'], r['source_detail'], r['url'])
+                cached = EMBED_CACHE.get(key)
+                if cached is not None:
+                    r['highlighted_embed'] = cached
+                    continue
+            pending.append((r, key))
+
+        # One precompiled pass per row: escapes the content and wraps BOT_KEYWORDS hits
+        for (r, highlighted_content, unique_matches), (_, key) in zip(highlight_rows(r for r, _ in pending), pending):
+            r['highlighted_embed'] = embed_card(r, highlighted_content, unique_matches)
+            if key is not None:
+                EMBED_CACHE.set(key, r['highlighted_embed'])
+
+        if prune and EMBED_CACHE is not None and pending:
+            EMBED_CACHE.prune()
+        print(f"Rendered {len(pending)} new embeds, {len(rows) - len(pending)} from cache")
         return rows
     
     except Exception as e:
@@ -851,9 +906,9 @@ def create_embeds_with_highlights(rows):
         for r in rows:
             r['highlighted_embed'] = f"""
             <div class="social-embed">
-                <div class="embed-content">{r['content']}</div>
+                <div class="embed-content">{escape(r['content'] or '')}</div>
                 <div class="embed-footer">
-                    <a href="{r.get('url', '#')}" target="_blank" class="view-link">View Original</a>
+                    <a href="{escape(r.get('url') or '#', quote=True)}" target="_blank" class="view-link">View Original</a>
                 </div>
             </div>
             """
@@ -979,12 +1034,176 @@ def calculate_trends(bot_mentions):
         print(f"❌ Error in calculate_trends: {e}")
         return 0  # Return 0 (no change) in case of error
 
+# ─── jinja environment (shared by every render) ──────────────────────────────
+def format_date(date, format_str):
+    """Format date in a cross-platform compatible way"""
+    if "%-" in format_str:
+        # For Windows compatibility, replace %-d with alternative
+        format_str = format_str.replace("%-d", "%#d" if os.name == 'nt' else "%-d")
+    return date.strftime(format_str)
+
+def create_template_env():
+    """
+    One Environment per process: templates are compiled once, kept in memory and their
+    bytecode persisted under report.template_cache_dir, so later runs skip compilation.
+    With report.template_auto_reload = false (production) templates are never re-stat'ed.
+    """
+    cache_dir = REPORT_CFG.get('template_cache_dir', 'cache/jinja')
+    os.makedirs(cache_dir, exist_ok=True)
+    env = Environment(
+        loader=FileSystemLoader(REPORT_CFG['template_dir']),
+        bytecode_cache=FileSystemBytecodeCache(cache_dir),
+        auto_reload=REPORT_CFG.get('template_auto_reload', True),
+    )
+    # Add tojson filter for passing data to JavaScript
+    env.filters['tojson'] = json.dumps
+    env.filters['format_date'] = format_date
+    return env
+
+TEMPLATE_ENV = create_template_env()
+
+def precompile_templates():
+    """Load every template once so the in-memory and bytecode caches are warm"""
+    names = TEMPLATE_ENV.list_templates(extensions=['html'])
+    for name in names:
+        TEMPLATE_ENV.get_template(name)
+    return names
+
+# ─── sharded static output ───────────────────────────────────────────────────
+# With report.sharded (default) the page is a small shell (report_shell.html) and the
+# bot rows and chart data are JSON shards next to it, one per source and month, that
+# the browser fetches when a tab is opened. Serve docs/ over HTTP: fetch() does not
+# work from file:// URLs.
+SHARDED       = REPORT_CFG.get('sharded', True)
+SHARD_DIR     = REPORT_CFG.get('shard_dir', 'data')
+PRECOMPRESS   = REPORT_CFG.get('precompress', ['gzip', 'br'])
+SNAPSHOT_CFG  = REPORT_CFG.get('debug_snapshots', {})
+
+def shard_slug(name):
+    return re.sub(r'[^A-Za-z0-9_-]+', '_', name).strip('_') or 'source'
+
+def shard_row(r):
+    """The subset of a bot row the shell page needs to draw one table row"""
+    return {
+        'date': format_date(r['post_date'], '%-d %b %Y %H:%M'),
+        'ts': r['post_date'].isoformat(),
+        'source': r['source'],
+        'label': r['source_detail'] or r['source'],
+        'url': r['url'],
+        'embed': r['highlighted_embed'],
+    }
+
+def build_shards(bot_sources, bot_chart_data):
+    """
+    Split the report data into {shard name: payload}: 'chart' plus '<source>/<YYYY-MM>'
+    for every source and month. Also returns the per-source month list (newest first)
+    that becomes the manifest once the shard file names are known.
+    """
+    shards = {'chart': bot_chart_data}
+    months = {}
+    for source, source_rows in bot_sources.items():
+        by_month = defaultdict(list)
+        for r in source_rows:
+            by_month[r['post_date'].strftime('%Y-%m')].append(shard_row(r))
+        months[source] = []
+        for month in sorted(by_month, reverse=True):
+            name = f"{shard_slug(source)}/{month}"
+            shards[name] = by_month[month]
+            months[source].append((month, name, len(by_month[month])))
+    return shards, months
+
+def write_report_shards(output_dir, bot_sources, bot_chart_data):
+    """Write the shards under output_dir/SHARD_DIR and return the manifest for the shell page"""
+    shards, months = build_shards(bot_sources, bot_chart_data)
+    files = write_shards(os.path.join(output_dir, SHARD_DIR), shards, PRECOMPRESS)
+    print(f"🧩 Wrote {len(files)} data shards to {os.path.join(output_dir, SHARD_DIR)}")
+    return {
+        'chart': files['chart'],
+        'sources': {
+            source: [{'month': m, 'count': n, 'file': files[name]} for m, name, n in entries]
+            for source, entries in months.items()
+        },
+    }
+
+def write_debug_snapshot(output_dir, html):
+    """Keep a timestamped copy of the page, pruned to report.debug_snapshots.keep / max_age_days"""
+    keep = SNAPSHOT_CFG.get('keep', 5)
+    if keep > 0:
+        debug_path = os.path.join(output_dir, f"report_debug_{int(datetime.now().timestamp())}.html")
+        write_atomic(debug_path, html)
+        print(f"🔍 Debug copy written to {debug_path}")
+    removed = prune_snapshots(os.path.join(output_dir, 'report_debug_*.html'),
+                              keep=keep, max_age_days=SNAPSHOT_CFG.get('max_age_days', 30))
+    if removed:
+        print(f"🧹 Removed {len(removed)} old debug snapshots")
+
+# ─── streaming export of a large window ───────────────────────────────────────
+def export_bot_mentions(since, until=None, output_dir=None, chunk_size=1000):
+    """
+    Export every bot-related post in [since, until) as per-source, per-month shards plus
+    a manifest with source and topic totals. Rows are streamed from an unbuffered cursor
+    in source/month order, so memory is bounded by the largest single source-month,
+    not by the window (a full year works the same as a week).
+    """
+    output_dir = output_dir or REPORT_CFG.get('export_dir', 'docs/export')
+    print(f"📦 Exporting bot-related posts since {since}{' until ' + until if until else ''} to {output_dir}")
+    
+    conn = get_db_conn()
+    if not conn:
+        print(f"⚠️ No database connection, nothing exported")
+        return None
+    
+    query = "SELECT * FROM external_mentions WHERE keyword_flags > 0 AND post_date >= %s"
+    params = [since]
+    if until:
+        query += " AND post_date < %s"
+        params.append(until)
+    query += " ORDER BY source, source_detail, post_date DESC"
+    
+    def bucket(r):
+        return r['source_detail'] or r['source'], r['post_date'].strftime('%Y-%m')
+    
+    source_counts, topic_counts = Counter(), Counter()
+    months = defaultdict(list)
+    root = os.path.join(output_dir, SHARD_DIR)
+    try:
+        for (source, month), group in groupby(stream_rows(conn, query, params, chunk_size), key=bucket):
+            group = list(group)
+            for r in group:
+                r['url'] = build_post_url(r)
+                topic_counts.update(TOPIC_MATCHER.matched_groups(r['content']))
+            source_counts[source] += len(group)
+            create_embeds_with_highlights(group, prune=False)
+            name = f"{shard_slug(source)}/{month}"
+            files = write_shards(root, {name: [shard_row(r) for r in group]}, PRECOMPRESS)
+            months[source].append({'month': month, 'count': len(group), 'file': files[name]})
+    finally:
+        conn.close()
+    
+    # One pass over the cache directory per export, not one per source-month
+    if EMBED_CACHE is not None:
+        EMBED_CACHE.prune()
+    
+    manifest = {
+        'since': since,
+        'until': until,
+        'sources': months,
+        'source_counts': dict(source_counts),
+        'topic_counts': dict(topic_counts),
+    }
+    write_atomic(os.path.join(output_dir, 'manifest.json'), json.dumps(manifest, indent=2), PRECOMPRESS)
+    print(f"🎉 Exported {sum(source_counts.values())} posts from {len(source_counts)} sources")
+    return manifest
+
 # ─── render to HTML with improved handling for Reddit and stats ───────────────────────────────────────
-def render(rows, bot_rows, overview, bot_mentions, sources, limit_per_source):
+def render(rows, bot_rows, overview, bot_mentions, sources, limit_per_source,
+           template_name=None, output_path=None):
     """Render the HTML report with improved source handling and stats"""
     print(f"🔍 Starting HTML rendering process")
     
     try:
+        template_name = template_name or ('report_shell.html' if SHARDED else 'report.html')
+        
         # Verify the template directory exists
         template_dir = REPORT_CFG['template_dir']
         if not os.path.exists(template_dir):
@@ -995,28 +1214,10 @@ def render(rows, bot_rows, overview, bot_mentions, sources, limit_per_source):
             # If this happens, we should create a simple template
             print(f"⚠️ No template file found, this may cause errors")
         
-        # Set up Jinja2 environment
-        print(f"Setting up Jinja2 environment")
-        env = Environment(loader=FileSystemLoader(template_dir))
-        
-        # Add tojson filter for passing data to JavaScript
-        env.filters['tojson'] = json.dumps
-        
-        # Add a custom filter for cross-platform date formatting
-        def format_date(date, format_str):
-            """Format date in a cross-platform compatible way"""
-            if "%-" in format_str:
-                # For Windows compatibility, replace %-d with alternative
-                format_str = format_str.replace("%-d", "%#d" if os.name == 'nt' else "%-d")
-            return date.strftime(format_str)
-        
-        # Register the filter
-        env.filters['format_date'] = format_date
-        
-        # Get the template
+        # Get the template (compiled once per process by TEMPLATE_ENV)
         try:
-            print(f"Loading template 'report.html'")
-            tpl = env.get_template('report.html')
+            print(f"Loading template '{template_name}'")
+            tpl = TEMPLATE_ENV.get_template(template_name)
             print(f"✅ Template loaded successfully")
         except Exception as e:
             print(f"❌ Error loading template: {e}")
@@ -1082,6 +1283,17 @@ def render(rows, bot_rows, overview, bot_mentions, sources, limit_per_source):
             'reddit_links': reddit_links  # Add Reddit links
         }
         
+        # Ensure output directory exists
+        output_path = output_path or REPORT_CFG['output_path']
+        output_dir = os.path.dirname(output_path) or '.'
+        if not os.path.exists(output_dir):
+            print(f"Creating output directory: {output_dir}")
+            os.makedirs(output_dir, exist_ok=True)
+        
+        if SHARDED:
+            template_vars['shards'] = write_report_shards(output_dir, bot_sources, bot_chart_data)
+            template_vars['shard_base'] = SHARD_DIR.rstrip('/') + '/'
+        
         print(f"✅ Template variables prepared")
         
         # Generate HTML
@@ -1093,24 +1305,21 @@ def render(rows, bot_rows, overview, bot_mentions, sources, limit_per_source):
             print(f"❌ Error rendering template: {e}")
             return
         
-        # Ensure output directory exists
-        output_path = REPORT_CFG['output_path']
-        output_dir = os.path.dirname(output_path)
-        if not os.path.exists(output_dir):
-            print(f"Creating output directory: {output_dir}")
-            os.makedirs(output_dir, exist_ok=True)
-        
-        # Write HTML to file
+        # Write HTML to file (atomically, with precompressed siblings)
         try:
-            with open(output_path, 'w', encoding='utf8') as f:
-                f.write(html)
+            write_atomic(output_path, html, PRECOMPRESS)
             print(f"🎉 Report written to {output_path}")
             
+            # Shards the new page no longer references can go once it is in place
+            if SHARDED:
+                referenced = [template_vars['shards']['chart']]
+                referenced += [m['file'] for months in template_vars['shards']['sources'].values() for m in months]
+                removed = remove_stale_shards(os.path.join(output_dir, SHARD_DIR), referenced)
+                if removed:
+                    print(f"🧹 Removed {removed} stale shard files")
+            
             # Also save a debug copy with timestamp
-            debug_path = os.path.join(output_dir, f"report_debug_{int(datetime.now().timestamp())}.html")
-            with open(debug_path, 'w', encoding='utf8') as f:
-                f.write(html)
-            print(f"🔍 Debug copy written to {debug_path}")
+            write_debug_snapshot(output_dir, html)
         except Exception as e:
             print(f"❌ Error writing HTML to file: {e}")
             
@@ -1126,14 +1335,39 @@ def render(rows, bot_rows, overview, bot_mentions, sources, limit_per_source):
     except Exception as e:
         print(f"❌ Unexpected error in render function: {e}")
 
-# ─── main with robust error handling ─────────────────────────────────────────────
-if __name__ == "__main__":
+# ─── report driver ────────────────────────────────────────────────────────────
+def timed(name, timings, fn, *args, **kwargs):
+    """Run one report section and record its wall-clock time in `timings`"""
+    start = time.perf_counter()
     try:
+        return fn(*args, **kwargs)
+    finally:
+        timings[name] = time.perf_counter() - start
+
+def build_report():
+    """
+    Compute the report sections concurrently and render them. The three DB sections run
+    in parallel; the overview (DeepSeek call) starts as soon as the rows it needs are in
+    and overlaps with the bot mentions history, so end-to-end latency is roughly the
+    slowest chain rather than the sum of all sections.
+    """
+    timings = {}
+    started = time.perf_counter()
+    
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="report") as pool:
+        # Compile (or load from the bytecode cache) every template while the DB queries
+        # run, so render() finds them ready; a template error still surfaces in render()
+        pool.submit(timed, 'templates', timings, precompile_templates)
         print(f"⏳ Fetching recent mentions from all sources...")
-        rows, sources, limit_per_source = fetch_rows()
-        
+        rows_future = pool.submit(timed, 'rows', timings, fetch_rows)
         print(f"🤖 Fetching bot-related mentions...")
-        bot_rows = fetch_bot_related_posts()
+        bot_rows_future = pool.submit(timed, 'bot_posts', timings, fetch_week_bot_posts,
+                                      REPORT_CFG.get('summary_days', 7), REPORT_CFG.get('bot_posts_min', 50))
+        print("📈 Fetching bot mentions history...")
+        mentions_future = pool.submit(timed, 'bot_mentions', timings, fetch_bot_mentions)
+        
+        rows, sources, limit_per_source = rows_future.result()
+        bot_rows = bot_rows_future.result()
         
         # Ensure bot_rows is always a list
         if bot_rows is None:
@@ -1144,16 +1378,36 @@ if __name__ == "__main__":
         
         # Generate bot-focused summary
         print("🗒️ Generating overview…")
-        overview = summarize_for_overview(rows, bot_rows)
+        overview_future = pool.submit(timed, 'overview', timings, summarize_for_overview, rows, bot_rows)
         
-        # Fetch bot mentions history
-        print("📈 Fetching bot mentions history...")
-        bot_mentions = fetch_bot_mentions()
-        
-        # Render HTML report with additional parameters
-        render(rows, bot_rows, overview, bot_mentions, sources, limit_per_source)
+        bot_mentions = mentions_future.result()
+        overview = overview_future.result()
+    
+    # Render HTML report with additional parameters
+    timed('render', timings, render, rows, bot_rows, overview, bot_mentions, sources, limit_per_source)
+    
+    total = time.perf_counter() - started
+    print("⏱️ Section timings: " + ", ".join(f"{k} {v:.2f}s" for k, v in timings.items()) + f" | total {total:.2f}s")
+    return timings
+
+# ─── main with robust error handling ─────────────────────────────────────────────
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Build the bot mentions report")
+    sub = parser.add_subparsers(dest='command')
+    export = sub.add_parser('export', help="stream bot-related posts for a date window into JSON shards")
+    export.add_argument('--since', required=True, help="YYYY-MM-DD")
+    export.add_argument('--until', help="YYYY-MM-DD (exclusive)")
+    export.add_argument('--out', help="output directory (default report.export_dir)")
+    args = parser.parse_args()
+    
+    try:
+        if args.command == 'export':
+            export_bot_mentions(args.since, args.until, args.out)
+        else:
+            build_report()
         
     except Exception as e:
         print(f"❌ Critical error in main function: {e}")
         import traceback
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
@@ -0,0 +1,65 @@
+"""
+Map-reduce summarization over many rows with a rate-limited LLM.
+
+Rows are grouped (per source by default) and cut into batches of `batch_size`. Each batch
+is summarized concurrently, never exceeding `requests_per_second`, and the partial
+summaries are combined by one final reduce call. The LLM itself is injected as
+`complete(messages) -> text`, so callers decide on model, caching and prompts.
+"""
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.rate_limit import TokenBucket
+
+
+def source_key(row):
+    return row.get('source_detail') or row.get('source') or 'unknown'
+
+
+def split_batches(rows, batch_size, key=source_key):
+    """Group rows by `key` (keeping input order) and chunk each group; returns [(label, rows)]."""
+    groups = defaultdict(list)
+    for r in rows:
+        groups[key(r)].append(r)
+    batches = []
+    for label, group in groups.items():
+        for i in range(0, len(group), batch_size):
+            batches.append((label, group[i:i + batch_size]))
+    return batches
+
+
+def summarize_batches(batches, complete, batch_messages, requests_per_second=1.0, max_workers=4):
+    """
+    Run `complete(batch_messages(label, rows))` for every batch in parallel under a shared
+    token bucket. Returns [(label, summary)] in batch order; failed batches are logged
+    and left out so one bad request doesn't sink the whole report.
+    """
+    bucket = TokenBucket(requests_per_second, burst=1)
+
+    def run(batch):
+        label, rows = batch
+        bucket.acquire()
+        try:
+            return label, complete(batch_messages(label, rows))
+        except Exception as e:
+            logging.error(f"Batch summary failed for {label} ({len(rows)} rows): {e}")
+            return label, None
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="summarize") as pool:
+        results = list(pool.map(run, batches))
+    return [(label, text) for label, text in results if text]
+
+
+def map_reduce_summary(rows, complete, batch_messages, reduce_messages, batch_size=20,
+                       requests_per_second=1.0, max_workers=4, key=source_key, reduce_complete=None):
+    """
+    Summarize all rows: one LLM call per batch, then one reduce call over the partial
+    summaries (with `reduce_complete` if given, e.g. for a larger token budget).
+    Returns (final_text, partials). Raises if every batch failed.
+    """
+    batches = split_batches(rows, batch_size, key)
+    partials = summarize_batches(batches, complete, batch_messages, requests_per_second, max_workers)
+    if not partials:
+        raise RuntimeError(f"all {len(batches)} batch summaries failed")
+    return (reduce_complete or complete)(reduce_messages(partials)), partials
@@ -0,0 +1,110 @@
+"""
+Deterministic synthetic data for the benchmarks: posts that look like what the scrapers
+store (mixed sources, bot/topic keywords at a realistic rate, messy whitespace and
+non-ASCII in the raw text) and 2+2-style thread pages for the HTML parsers.
+"""
+import random
+from datetime import datetime, timedelta
+from html import escape
+
+SOURCES = [
+    ("2+2 Forum", "Forum_1"),
+    ("2+2 Forum", "Forum_2"),
+    ("Reddit", "r/poker"),
+    ("Reddit", "r/onlinepoker"),
+    ("X", "acr_poker"),
+]
+
+FILLER = (
+    "the of and to a in is it that for on was with as i his they be at one have this from "
+    "hand river flop turn raise call fold stack blinds table session rake deposit cashout "
+    "tournament satellite freeroll support account withdrawal variance villain hero pot"
+).split()
+
+KEYWORDS = [
+    "bot", "bots", "botting", "cheat", "cheating", "collusion", "colluders", "security",
+    "hack", "exploit", "poker bot", "automation", "ACR", "winning poker network", "fraud",
+]
+
+DATE_FORMATS = [
+    "%b %d, %Y, %I:%M %p",
+    "%m-%d-%Y, %I:%M %p",
+    "%d %b %Y %H:%M",
+    "%Y-%m-%d %H:%M:%S",
+]
+
+START = datetime(2024, 1, 1)
+
+
+def make_text(rng, words=40, keyword_rate=0.3):
+    tokens = [rng.choice(FILLER) for _ in range(rng.randint(words // 2, words * 2))]
+    if rng.random() < keyword_rate:
+        for _ in range(rng.randint(1, 3)):
+            tokens.insert(rng.randrange(len(tokens) + 1), rng.choice(KEYWORDS))
+    return " ".join(tokens)
+
+
+def make_posts(n, seed=0, keyword_rate=0.3):
+    """
+    n post dicts with both the raw scraped fields (raw_content, date_text) and the stored
+    row fields the report uses. Dates spread over max(365, n // 100) days, so larger
+    corpora also span more months.
+    """
+    rng = random.Random(seed)
+    span = max(365, n // 100) * 86400
+    posts = []
+    for i in range(n):
+        source, detail = SOURCES[i % len(SOURCES)]
+        post_date = START + timedelta(seconds=rng.randrange(span))
+        text = make_text(rng, keyword_rate=keyword_rate)
+        raw = "\n  " + text.replace(" ", "  ", 3) + " ’\r\n"
+        posts.append({
+            'id': i + 1,
+            'source': source,
+            'source_detail': detail,
+            'external_id': f"post{1000000 + i}",
+            'username': f"user{rng.randrange(5000)}",
+            'post_date': post_date,
+            'date_text': post_date.strftime(rng.choice(DATE_FORMATS)),
+            'raw_content': raw,
+            'content': text,
+            'content_hash': f"{rng.getrandbits(256):064x}",
+            'url': f"https://example.com/{detail}/{i}",
+        })
+    return posts
+
+
+def make_keywords(n, seed=0):
+    """
+    n whole-word keywords: the real tracked ones first, then made-up terms that
+    never occur in make_posts() text, for measuring how matching scales with list size.
+    """
+    rng = random.Random(seed)
+    terms = list(dict.fromkeys(k.lower() for k in KEYWORDS))[:n]
+    seen = set(terms) | set(FILLER)
+    while len(terms) < n:
+        term = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10)))
+        if term not in seen:
+            seen.add(term)
+            terms.append(term)
+    return terms
+
+
+def make_forum_pages(posts, per_page=20):
+    """Render posts as 2+2 thread pages in the markup scrapers/parsers.py expects."""
+    pages = []
+    for start in range(0, len(posts), per_page):
+        blocks = []
+        for p in posts[start:start + per_page]:
+            blocks.append(f"""
+<div id="{p['external_id']}" class="post">
+  <div class="post__header"><a class="h2 username" href="/u/{p['username']}">{escape(p['username'])}</a>
+    <div class="caption--small">{escape(p['date_text'])}</div></div>
+  <div class="post__message"><p>{escape(p['raw_content'])}</p></div>
+</div>""")
+        pages.append(
+            "<html><head><title>Thread</title></head><body><div class=\"thread\">"
+            + "".join(blocks)
+            + "</div></body></html>"
+        )
+    return pages
@@ -0,0 +1,316 @@
+"""
+Record/replay for every HTTP call the pipeline makes, for offline end-to-end runs.
+
+The forum scraper and the DeepSeek call use `requests` directly, and PRAW (prawcore)
+and tweepy both send through `requests.Session`, so patching Session.request covers
+all four.
+
+record  Calls go to the network as usual; each response is also saved to a cassette
+        directory, one JSON file per request key (method, URL, body).
+replay  Calls are sent to a local stand-in server (ReplayServer) that answers from
+        the cassettes, with configurable latency and injected errors, so throughput
+        can be measured and profiled reproducibly with no network.
+
+    python run_scraper_pipeline.py --record data/http_cassettes
+    python run_scraper_pipeline.py --replay data/http_cassettes --latency-ms 20,80 --error-rate 0.02
+    python -m benchmarks.http_replay serve data/http_cassettes --port 8099
+
+Cassettes hold raw API responses, including OAuth tokens issued to the recording
+run: keep them out of git (data/ is ignored).
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import runpy
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+# Query parameters that change from run to run (time windows) and must not be part
+# of the request key, or nothing recorded yesterday would ever match
+VOLATILE_PARAMS = {'start_time', 'end_time', 'since_id', '_'}
+# Response headers that no longer describe the stored (already decoded) body
+DROP_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection'}
+REPLAY_URL_HEADER = 'X-Replay-Url'
+
+
+def request_key(method, url, body=None, ignore_params=VOLATILE_PARAMS):
+    """Stable key for a request: method, URL with sorted non-volatile params, body digest."""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in ignore_params)
+    normalized = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ''))
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    digest = hashlib.sha256(body or b'').hexdigest()
+    return hashlib.sha256(f"{method.upper()} {normalized} {digest}".encode('utf-8')).hexdigest()
+
+
+class Cassette:
+    """Directory of recorded responses: <key>.json holds every response seen for that key, in order."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._cursor = {}
+        self._loaded = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load(self, key):
+        try:
+            with open(self._path(key), encoding='utf8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key, method, url, response):
+        entry = {
+            'method': method,
+            'url': url,
+            'status': response.status_code,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in DROP_HEADERS},
+            'body': base64.b64encode(response.content).decode('ascii'),
+            'elapsed_ms': response.elapsed.total_seconds() * 1000 if response.elapsed else None,
+        }
+        with self._lock:
+            data = self._load(key) or {'method': method, 'url': url, 'responses': []}
+            data['responses'].append(entry)
+            tmp = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self._path(key))
+
+    def next(self, key):
+        """The next recorded response for key, cycling through repeats (pagination, polling)."""
+        with self._lock:
+            if key not in self._loaded:
+                self._loaded[key] = self._load(key)
+            data = self._loaded[key]
+            if not data or not data['responses']:
+                return None
+            i = self._cursor.get(key, 0)
+            self._cursor[key] = i + 1
+            return data['responses'][i % len(data['responses'])]
+
+
+# ── Stand-in server ────────────────────────────────────────────────────────────
+class ReplayServer:
+    """
+    Threaded local HTTP server answering from a Cassette. The original URL travels in
+    the X-Replay-Url header. Every response waits a random latency in
+    [latency_ms[0], latency_ms[1]]; with probability error_rate it is replaced by
+    error_status. Requests that were never recorded get a 404.
+    """
+
+    def __init__(self, cassette_dir, host='127.0.0.1', port=0, latency_ms=(0, 0),
+                 error_rate=0.0, error_status=503, seed=None):
+        self.cassette = Cassette(cassette_dir)
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'served': 0, 'errors': 0, 'missing': 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _draw(self):
+        with self._lock:
+            delay = self._rng.uniform(*self.latency_ms) / 1000
+            fail = self._rng.random() < self.error_rate
+        return delay, fail
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                url = self.headers.get(REPLAY_URL_HEADER, '')
+                delay, fail = server._draw()
+                time.sleep(delay)
+
+                if fail:
+                    server._count('errors')
+                    return self._send(server.error_status, {'Content-Type': 'application/json'},
+                                      b'{"error": "injected failure"}')
+                recorded = server.cassette.next(request_key(self.command, url, body))
+                if recorded is None:
+                    server._count('missing')
+                    return self._send(404, {'Content-Type': 'application/json'},
+                                      json.dumps({'error': 'not recorded', 'url': url}).encode('utf-8'))
+                server._count('served')
+                self._send(recorded['status'], recorded['headers'], base64.b64decode(recorded['body']))
+
+            def _send(self, status, headers, body):
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _serve
+
+            def log_message(self, fmt, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='replay-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+# ── requests.Session patch ─────────────────────────────────────────────────────
+_original_request = requests.Session.request
+
+
+def _prepare(session, method, url, kwargs):
+    req = requests.Request(method=method.upper(), url=url, params=kwargs.get('params'),
+                           data=kwargs.get('data'), json=kwargs.get('json'),
+                           headers=kwargs.get('headers'), files=kwargs.get('files'))
+    return session.prepare_request(req)
+
+
+def install(mode, cassette_dir=None, server_url=None):
+    """
+    Patch requests.Session.request for the whole process. mode 'record' needs
+    cassette_dir, 'replay' needs the server_url of a running ReplayServer.
+    Returns a function that restores the original.
+    """
+    if mode == 'record':
+        cassette = Cassette(cassette_dir)
+
+        def request(self, method, url, **kwargs):
+            # keyed by the request as issued, so redirects replay under the original URL
+            prepared = _prepare(self, method, url, kwargs)
+            response = _original_request(self, method, url, **kwargs)
+            cassette.save(request_key(prepared.method, prepared.url, prepared.body),
+                          prepared.method, prepared.url, response)
+            return response
+    elif mode == 'replay':
+        def request(self, method, url, **kwargs):
+            prepared = _prepare(self, method, url, kwargs)
+            headers = {REPLAY_URL_HEADER: prepared.url}
+            if prepared.headers.get('Content-Type'):
+                headers['Content-Type'] = prepared.headers['Content-Type']
+            response = _original_request(self, prepared.method, f"{server_url}/replay",
+                                         data=prepared.body, headers=headers,
+                                         timeout=kwargs.get('timeout'), allow_redirects=False)
+            response.url = prepared.url
+            return response
+    else:
+        raise ValueError(f"unknown mode {mode!r}")
+
+    requests.Session.request = request
+    return uninstall
+
+
+def uninstall():
+    requests.Session.request = _original_request
+
+
+@contextmanager
+def http_replay(mode, cassette_dir, latency_ms=(0, 0), error_rate=0.0, error_status=503, seed=None):
+    """
+    Record into, or replay from, cassette_dir for the duration of the block. In replay
+    mode this starts a ReplayServer and yields it (for .stats and .url); in record mode
+    it yields None.
+    """
+    server = None
+    if mode == 'replay':
+        server = ReplayServer(cassette_dir, latency_ms=latency_ms, error_rate=error_rate,
+                              error_status=error_status, seed=seed).start()
+        install('replay', server_url=server.url)
+    else:
+        install('record', cassette_dir)
+    try:
+        yield server
+    finally:
+        uninstall()
+        if server is not None:
+            server.stop()
+
+
+ENV_MODE, ENV_TARGET = 'HTTP_REPLAY_MODE', 'HTTP_REPLAY_TARGET'
+
+
+def install_from_env():
+    """Install in a child process from HTTP_REPLAY_MODE and HTTP_REPLAY_TARGET (dir or server URL)."""
+    mode = os.environ.get(ENV_MODE)
+    if mode == 'record':
+        install('record', cassette_dir=os.environ[ENV_TARGET])
+    elif mode == 'replay':
+        install('replay', server_url=os.environ[ENV_TARGET])
+
+
+def parse_latency(text):
+    """'50' -> (50, 50); '20,80' -> (20, 80)"""
+    low, _, high = text.partition(',')
+    return float(low), float(high or low)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP record/replay harness")
+    sub = parser.add_subparsers(dest='command', required=True)
+    serve = sub.add_parser('serve', help="run the stand-in server on a cassette directory")
+    serve.add_argument('cassette_dir')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8099)
+    serve.add_argument('--latency-ms', type=parse_latency, default=(0, 0))
+    serve.add_argument('--error-rate', type=float, default=0.0)
+    serve.add_argument('--error-status', type=int, default=503)
+    serve.add_argument('--seed', type=int)
+    run = sub.add_parser('exec', help="run a script with the patch installed from the environment")
+    run.add_argument('script')
+    run.add_argument('args', nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        server = ReplayServer(args.cassette_dir, args.host, args.port, args.latency_ms,
+                              args.error_rate, args.error_status, args.seed)
+        print(f"Replaying {args.cassette_dir} on {server.url} (Ctrl+C to stop)")
+        try:
+            server._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            print(f"Served {server.stats}")
+        return 0
+
+    install_from_env()
+    sys.argv = [args.script] + args.args
+    runpy.run_path(args.script, run_name='__main__')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
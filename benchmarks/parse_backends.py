@@ -0,0 +1,121 @@
+"""
+Check that every available parser backend returns the same post tuples as the bs4
+reference, then report parse throughput per backend.
+
+Usage:
+    python -m benchmarks.parse_backends [path/to/saved_pages] [--posts 2000] [--repeat 3]
+
+Pages are a built-in fixture with the markup that trips backends up (script/style,
+nested quotes, comments, entities) plus synthetic thread pages from
+benchmarks.corpus. `saved_pages`, if given, adds a directory of .html files saved
+from real 2+2 thread pages.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+from benchmarks.corpus import make_forum_pages, make_posts
+from scrapers.parsers import BACKENDS, get_backend, parse_page
+
+FIXTURE = """<html><head><title>Thread</title>
+<style>.post { color: red } /* bot */</style>
+<script>var bot = 1;</script></head>
+<body><div class="thread">
+<div id="post1001" class="post">
+  <div class="post__header"><a class="h2 username" href="/u/a"> alice </a>
+    <div class="caption--small">Mar 3, 2024, 9:15 PM</div></div>
+  <div class="post__message">
+    <p>Hello <script>var bot=1;</script>bot there<style>p{}</style>x</p>
+    <blockquote><div class="quote">quoting <i>someone</i> about <a href="#">colluders</a></div></blockquote>
+    <!-- hidden bot comment -->
+    <p>Caf&eacute; &amp; r&eacute;sum&eacute; &#8217;quotes&#8217;<br>second line</p>
+  </div>
+</div>
+<div id="post1002" class="post">
+  <div class="post__header"><a class="h2 username" href="/u/b">bob</a>
+    <div class="caption--small">03-04-2024, 10:00 AM</div></div>
+  <div class="post__message"><div><div><span>deep <em>nested <strong>security</strong></em> text</span></div></div></div>
+</div>
+<div id="post1003" class="post">
+  <div class="post__header"><a class="h2 username" href="/u/c">carol</a></div>
+  <div class="post__message">no date here</div>
+</div>
+<div id="post_message_1004"><div class="post__message">placeholder</div></div>
+</div></body></html>"""
+
+
+def load_pages(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, encoding='utf8', errors='replace') as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def builtin_pages(n_posts, seed=0):
+    synthetic = make_forum_pages(make_posts(n_posts, seed=seed))
+    return [('fixture.html', FIXTURE)] + [(f"synthetic-{i}.html", html) for i, html in enumerate(synthetic)]
+
+
+def check_equivalence(pages, backends):
+    reference = get_backend('bs4')
+    mismatches = 0
+    for name, html in pages:
+        expected = parse_page(html, 'bench', 0, set(), reference)
+        for backend in backends:
+            got = parse_page(html, 'bench', 0, set(), backend)
+            if got != expected:
+                mismatches += 1
+                print(f"❌ {backend.name} differs from bs4 on {name}: {len(got)} vs {len(expected)} posts")
+    return mismatches
+
+
+def measure(pages, backend, repeat):
+    total_bytes = sum(len(html) for _, html in pages) * repeat
+    start = time.perf_counter()
+    posts = 0
+    for _ in range(repeat):
+        for _, html in pages:
+            posts += len(parse_page(html, 'bench', 0, set(), backend))
+    elapsed = time.perf_counter() - start
+    return {
+        'backend': backend.name,
+        'pages_per_sec': len(pages) * repeat / elapsed,
+        'posts_per_sec': posts / elapsed,
+        'mb_per_sec': total_bytes / elapsed / 1e6,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('pages_dir', nargs='?', help="directory of saved .html pages to add")
+    parser.add_argument('--posts', type=int, default=2000, help="synthetic posts to render into pages")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    pages = builtin_pages(args.posts)
+    if args.pages_dir:
+        saved = load_pages(args.pages_dir)
+        if not saved:
+            print(f"No .html files in {args.pages_dir}")
+            return 1
+        pages += saved
+
+    # Unavailable backends resolve to bs4, so dedupe by the backend actually returned
+    backends = list({b.name: b for b in map(get_backend, BACKENDS)}.values())
+    others = [b for b in backends if b.name != 'bs4']
+
+    mismatches = check_equivalence(pages, others)
+    print(f"Equivalence: {len(pages)} pages, {len(others)} alternative backend(s), {mismatches} mismatch(es)")
+
+    for backend in backends:
+        r = measure(pages, backend, args.repeat)
+        print(f"{r['backend']:>6}: {r['pages_per_sec']:8.1f} pages/s  "
+              f"{r['posts_per_sec']:9.1f} posts/s  {r['mb_per_sec']:6.2f} MB/s")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""
+Microbenchmarks for the ingestion and report hot paths on synthetic corpora.
+
+Usage:
+    python -m benchmarks.run [--sizes 10000,100000] [--only clean_text,parse_page]
+                             [--repeat 3] [--output results.json]
+                             [--baseline baseline.json] [--threshold 0.15]
+
+--full runs 10k, 100k and 1M posts. Results are JSON ({"meta": ..., "results": [...]})
+with one entry per benchmark and corpus size; pass an earlier results file as
+--baseline to print the change and exit 1 when anything got slower than the threshold.
+Benchmarks whose dependencies are missing (bs4, praw, jinja2, ...) are recorded as skipped.
+
+Scraper and report modules read config.json at import, so they are imported from a
+temporary directory holding a synthetic config (SQLite in memory, caches off).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.corpus import make_forum_pages, make_keywords, make_posts
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register `setup(posts, env) -> (workload, ops)`; workload() is what gets timed."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# ── Synthetic environment ──────────────────────────────────────────────────────
+def synthetic_config(workdir):
+    return {
+        "db_backend": "sqlite",
+        "sqlite": {"path": "memory:benchmarks"},
+        "db_config": {},
+        "db_twitter": {},
+        "forums": [{"name": "Forum_1", "base_url": "https://forumserver.twoplustwo.com/t/1/", "start_page": 1},
+                   {"name": "Forum_2", "base_url": "https://forumserver.twoplustwo.com/t/2/", "start_page": 1}],
+        "reddit": {"client_id": "", "client_secret": "", "user_agent": "benchmarks"},
+        "deepseek_api_key": "",
+        "summarizer": {
+            "model": "deepseek-chat", "max_tokens": 500, "batch_size": 20, "delay_seconds": 0,
+            "prompts": {"system_prompt": "", "system_prompt_weekly": ""},
+            "cache": {"enabled": False},
+        },
+        "report": {
+            "template_dir": os.path.join(REPO_ROOT, "templates"),
+            "template_cache_dir": os.path.join(workdir, "cache", "jinja"),
+            "template_auto_reload": False,
+            "output_path": os.path.join(workdir, "docs", "index.html"),
+            "sharded": False,
+            "precompress": [],
+            "debug_snapshots": {"keep": 0},
+            "embed_cache": {"enabled": False},
+        },
+    }
+
+
+class SyntheticEnv:
+    """Temp dir with config.json; modules that read config at import are imported inside it."""
+
+    def __init__(self):
+        if REPO_ROOT not in sys.path:
+            sys.path.insert(0, REPO_ROOT)
+        self._tmp = tempfile.TemporaryDirectory(prefix="bench-")
+        self.workdir = self._tmp.name
+        os.makedirs(os.path.join(self.workdir, "logs"), exist_ok=True)
+        with open(os.path.join(self.workdir, "config.json"), "w") as f:
+            json.dump(synthetic_config(self.workdir), f)
+
+    @contextlib.contextmanager
+    def inside(self):
+        cwd = os.getcwd()
+        os.chdir(self.workdir)
+        try:
+            yield
+        finally:
+            os.chdir(cwd)
+
+    def load(self, module):
+        with self.inside(), contextlib.redirect_stdout(io.StringIO()):
+            return __import__(module, fromlist=['*'])
+
+    def close(self):
+        self._tmp.cleanup()
+
+
+# ── Benchmarks ─────────────────────────────────────────────────────────────────
+@benchmark('clean_text')
+def bench_clean_text(posts, env):
+    from utils.cleaning import clean_text
+    raws = [p['raw_content'] for p in posts]
+    return lambda: [clean_text(t) for t in raws], len(raws)
+
+
+@benchmark('clean_date')
+def bench_clean_date(posts, env):
+    from utils.cleaning import clean_date
+    dates = [p['date_text'] for p in posts]
+    return lambda: [clean_date(d) for d in dates], len(dates)
+
+
+@benchmark('contains_bot_mention')
+def bench_contains_bot_mention(posts, env):
+    from utils.cleaning import contains_bot_mention
+    texts = [p['content'] for p in posts]
+    return lambda: [contains_bot_mention(t) for t in texts], len(texts)
+
+
+@benchmark('generate_hash')
+def bench_generate_hash(posts, env):
+    from utils.hashing import generate_hash
+    fields = [(p['source_detail'], p['external_id'], p['username'], p['date_text'], p['content']) for p in posts]
+    return lambda: [generate_hash(*f) for f in fields], len(fields)
+
+
+@benchmark('parse_page')
+def bench_parse_page(posts, env):
+    from scrapers.parsers import get_backend, parse_page
+    pages = make_forum_pages(posts)
+    backend = get_backend('bs4')
+    return lambda: [parse_page(html, 'Forum_1', i, (), backend) for i, html in enumerate(pages)], len(posts)
+
+
+@benchmark('parse_page_lxml')
+def bench_parse_page_lxml(posts, env):
+    from scrapers.parsers import LxmlBackend, parse_page
+    pages = make_forum_pages(posts)
+    backend = LxmlBackend()
+    return lambda: [parse_page(html, 'Forum_1', i, (), backend) for i, html in enumerate(pages)], len(posts)
+
+
+@benchmark('match_terms')
+def bench_match_terms(posts, env):
+    reddit = env.load('scrapers.reddit_scraper')
+    texts = [p['content'] for p in posts]
+
+    def run():
+        for t in texts:
+            reddit.match_terms(t, reddit.BRANDS)
+            reddit.match_terms(t, reddit.RISKS)
+    return run, len(texts)
+
+
+# Same posts, growing keyword lists of mostly absent terms: time per post should stay flat
+KEYWORD_COUNTS = (25, 100, 400, 1600)
+
+
+def _keyword_matcher_bench(n):
+    def setup(posts, env):
+        from utils.matching import KeywordMatcher
+        matcher = KeywordMatcher(make_keywords(n))
+        texts = [p['content'] for p in posts]
+        return lambda: [matcher.find_all(t) for t in texts], len(texts)
+    return setup
+
+
+for _n in KEYWORD_COUNTS:
+    benchmark(f'keyword_matcher_{_n}')(_keyword_matcher_bench(_n))
+
+
+def _bot_rows(posts):
+    from utils.cleaning import contains_bot_mention
+    return [dict(p) for p in posts if contains_bot_mention(p['content'])]
+
+
+@benchmark('create_embeds_with_highlights')
+def bench_create_embeds(posts, env):
+    report = env.load('Report_Sumarization')
+    rows = _bot_rows(posts)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            report.create_embeds_with_highlights(rows)
+    return run, len(rows)
+
+
+def _bot_mentions(report, posts):
+    """Month/source aggregate in the shape fetch_bot_mentions() returns."""
+    from utils.cleaning import contains_bot_mention
+    counts = {}
+    for p in posts:
+        key = (p['post_date'].strftime('%Y-%m'), p['source'])
+        entry = counts.setdefault(key, {'month': key[0], 'source': key[1], 'count': 0, 'total': 0})
+        entry['total'] += 1
+        entry['count'] += contains_bot_mention(p['content'])
+    with contextlib.redirect_stdout(io.StringIO()):
+        return report.summarize_bot_mentions(list(counts.values()))
+
+
+@benchmark('generate_bot_chart_data')
+def bench_generate_bot_chart_data(posts, env):
+    report = env.load('Report_Sumarization')
+    mentions = _bot_mentions(report, posts)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            report.generate_bot_chart_data(mentions)
+    return run, len(mentions)
+
+
+@benchmark('render')
+def bench_render(posts, env):
+    """render() end to end: embeds, grouping, chart data, template and file write."""
+    report = env.load('Report_Sumarization')
+    bot_rows = _bot_rows(posts)
+    mentions = _bot_mentions(report, posts)
+    sources = [{'source': s, 'source_detail': d} for s, d in {(p['source'], p['source_detail']) for p in posts}]
+    overview = "<h3>Bot & Security Mentions Overview</h3><p>Synthetic benchmark run.</p>"
+
+    def run():
+        with env.inside(), contextlib.redirect_stdout(io.StringIO()):
+            report.render(posts, [dict(r) for r in bot_rows], overview, mentions, sources, 10)
+    return run, len(bot_rows)
+
+
+# ── Runner ─────────────────────────────────────────────────────────────────────
+def run_one(name, posts, env, repeat):
+    try:
+        workload, ops = BENCHMARKS[name](posts, env)
+    except Exception as e:  # missing optional dependency, or config-dependent import failed
+        return {'name': name, 'size': len(posts), 'skipped': f"{type(e).__name__}: {e}"}
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        workload()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        'name': name,
+        'size': len(posts),
+        'ops': ops,
+        'repeat': repeat,
+        'best_s': best,
+        'mean_s': sum(times) / len(times),
+        'ops_per_sec': ops / best if best else float('inf'),
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Print per-benchmark change against a baseline; return the entries that regressed."""
+    previous = {(r['name'], r['size']): r for r in baseline.get('results', []) if 'ops_per_sec' in r}
+    regressions = []
+    for r in results:
+        old = previous.get((r['name'], r['size']))
+        if 'ops_per_sec' not in r or old is None:
+            continue
+        change = r['ops_per_sec'] / old['ops_per_sec'] - 1
+        flag = ''
+        if change < -threshold:
+            flag = '  ❌ regression'
+            regressions.append({**r, 'baseline_ops_per_sec': old['ops_per_sec'], 'change': change})
+        print(f"{r['name']:>30} {r['size']:>8}: {change:+7.1%}{flag}", file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='10000', help="comma-separated corpus sizes")
+    parser.add_argument('--full', action='store_true', help="use 10k, 100k and 1M posts")
+    parser.add_argument('--only', help="comma-separated benchmark names")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write JSON results here (default: stdout)")
+    parser.add_argument('--baseline', help="earlier results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="allowed slowdown vs baseline before failing (0.15 = 15%%)")
+    parser.add_argument('--list', action='store_true', help="list benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    sizes = [10_000, 100_000, 1_000_000] if args.full else [int(s) for s in args.sizes.split(',')]
+
+    env = SyntheticEnv()
+    results = []
+    try:
+        for size in sizes:
+            posts = make_posts(size, seed=args.seed)
+            for name in names:
+                r = run_one(name, posts, env, args.repeat)
+                results.append(r)
+                if 'skipped' in r:
+                    print(f"{name:>30} {size:>8}: skipped ({r['skipped']})", file=sys.stderr)
+                else:
+                    print(f"{name:>30} {size:>8}: {r['best_s']:8.3f}s  {r['ops_per_sec']:12.0f} ops/s",
+                          file=sys.stderr)
+    finally:
+        env.close()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}",
+                  file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
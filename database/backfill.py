@@ -0,0 +1,68 @@
+"""
+Backfill derived columns for rows stored before they existed.
+
+    python -m database.backfill keyword-flags [--all] [--chunk-size 5000]
+    python -m database.backfill rollup [--since YYYY-MM-DD]
+
+Run `python -m database.migrations` first, and rebuild the rollup after a keyword-flags backfill.
+"""
+import argparse
+
+from database.connection import create_forum_connection, create_twitter_connection
+from database.rollup import rebuild_rollup
+from utils.cleaning import keyword_flags
+
+
+def backfill_keyword_flags(conn, chunk_size=5000, recompute=False):
+    """
+    Tag rows with keyword_flags/topic_flags, walking the table by id in chunks and
+    committing after each chunk so the job can be interrupted and resumed.
+    By default only untagged rows are touched; recompute=True retags everything
+    (needed after appending to BOT_KEYWORDS/TOPICS).
+    """
+    cursor = conn.cursor()
+    last_id = 0
+    updated = 0
+    while True:
+        query = "SELECT id, content FROM external_mentions WHERE id > %s"
+        if not recompute:
+            query += " AND keyword_flags IS NULL"
+        cursor.execute(query + " ORDER BY id LIMIT %s;", (last_id, chunk_size))
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        cursor.executemany(
+            "UPDATE external_mentions SET keyword_flags = %s, topic_flags = %s WHERE id = %s;",
+            [keyword_flags(content) + (row_id,) for row_id, content in rows]
+        )
+        conn.commit()
+        last_id = rows[-1][0]
+        updated += len(rows)
+        print(f"… tagged {updated} rows (up to id {last_id})", flush=True)
+    cursor.close()
+    return updated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill derived columns in external_mentions")
+    sub = parser.add_subparsers(dest='command', required=True)
+    flags = sub.add_parser('keyword-flags', help="populate keyword_flags/topic_flags")
+    flags.add_argument('--all', action='store_true', help="recompute rows that are already tagged")
+    flags.add_argument('--chunk-size', type=int, default=5000)
+    rollup = sub.add_parser('rollup', help="rebuild mention_rollup from external_mentions")
+    rollup.add_argument('--since', help="only rebuild buckets from this date (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    for label, connect in (("forum", create_forum_connection), ("twitter", create_twitter_connection)):
+        conn = connect()
+        if args.command == 'keyword-flags':
+            n = backfill_keyword_flags(conn, args.chunk_size, recompute=args.all)
+            print(f"[{label}] keyword flags: {n} rows tagged")
+        elif args.command == 'rollup':
+            rebuild_rollup(conn, args.since)
+            print(f"[{label}] mention_rollup rebuilt{' since ' + args.since if args.since else ''}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
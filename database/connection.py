@@ -1,19 +1,130 @@
 import json
-import mysql.connector
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    from mysql.connector import errors, pooling
+except ImportError:  # only needed for the default MySQL backend
+    errors = pooling = None
+
+from database import sqlite_backend
 
 # Load entire config once
 with open('config.json', 'r') as f:
     cfg = json.load(f)
 
+# Connection settings per logical database. 'report' is what Report_Sumarization.py reads
+# (db_config); the forum DB also accepts db_config as the legacy name.
+DATABASES = {
+    'forum': cfg.get('db_forum', cfg.get('db_config')),
+    'twitter': cfg.get('db_twitter'),
+    'report': cfg.get('db_config', cfg.get('db_forum')),
+}
+
+# "mysql" (default) or "sqlite": with sqlite every logical database is a local file,
+# sqlite: {"path": "data/mentions.sqlite3", "<database>": "<path>"}; ":memory:" for tests
+BACKEND = cfg.get('db_backend', 'mysql')
+SQLITE_CFG = cfg.get('sqlite', {})
+
+# db_pool: {"size": 5 (forum: max_parallel_forums), "timeout": 30, "ping": true, "reconnect_attempts": 3,
+#           "reconnect_delay": 1, "<database>": {"size": ...}}
+POOL_CFG = cfg.get('db_pool', {})
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def pool_setting(name, key, default):
+    return POOL_CFG.get(name, {}).get(key, POOL_CFG.get(key, default))
+
+
+# mysql.connector refuses pools larger than this (pooling.CNX_POOL_MAXSIZE)
+MAX_POOL_SIZE = 32
+
+
+def pool_size(name):
+    """
+    Connections in the `name` pool. Each parallel forum crawl holds a forum connection
+    for its whole run, so that pool defaults to fetcher.max_parallel_forums (all forums
+    unless set) rather than 5; every pool is clamped to the connector's maximum.
+    """
+    default = 5
+    if name == 'forum':
+        fetcher_cfg = cfg.get('fetcher', {})
+        default = max(default, fetcher_cfg.get('max_parallel_forums') or len(cfg.get('forums', [])))
+    return max(1, min(pool_setting(name, 'size', default), MAX_POOL_SIZE))
+
+
+def get_pool(name):
+    """The process-wide pool for a database in DATABASES, created on first use."""
+    with _pools_lock:
+        if name not in _pools:
+            db_cfg = DATABASES.get(name)
+            if not db_cfg:
+                raise KeyError(f"No database config for '{name}'")
+            _pools[name] = pooling.MySQLConnectionPool(
+                pool_name=f"{name}_pool",
+                pool_size=pool_size(name),
+                pool_reset_session=True,
+                **db_cfg
+            )
+        return _pools[name]
+
+
+def get_connection(name='forum'):
+    """
+    Borrow a connection from the `name` pool; conn.close() hands it back.
+    With the sqlite backend this opens the configured database file instead (no pool needed).
+
+    Waits up to db_pool.timeout seconds when every connection is in use. Unless
+    db_pool.ping is false, the connection is pinged before it is returned and
+    reconnected if the server dropped it (stale after wait_timeout, restarts).
+    """
+    if BACKEND == 'sqlite':
+        return sqlite_backend.connect(SQLITE_CFG.get(name, SQLITE_CFG.get('path', 'data/mentions.sqlite3')))
+
+    pool = get_pool(name)
+    deadline = time.monotonic() + pool_setting(name, 'timeout', 30)
+    while True:
+        try:
+            conn = pool.get_connection()
+            break
+        except errors.PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+    if pool_setting(name, 'ping', True):
+        try:
+            conn.ping(reconnect=True,
+                      attempts=pool_setting(name, 'reconnect_attempts', 3),
+                      delay=pool_setting(name, 'reconnect_delay', 1))
+        except errors.Error as e:
+            logging.warning(f"Pooled {name} connection failed health check: {e}")
+            conn.close()
+            raise
+    return conn
+
+
+@contextmanager
+def connection(name='forum'):
+    """`with connection('twitter') as conn:` borrows and always returns a pooled connection."""
+    conn = get_connection(name)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
 def create_forum_connection():
-    """Connect to your forum_scraper database."""
-    # Support both 'db_forum' and legacy 'db_config'
-    db_cfg = cfg.get('db_forum', cfg.get('db_config'))
-    return mysql.connector.connect(**db_cfg)
+    """Connect to your forum_scraper database (pooled)."""
+    return get_connection('forum')
 
 def create_twitter_connection():
-    """Connect to your xapidata Twitter database."""
-    return mysql.connector.connect(**cfg['db_twitter'])
+    """Connect to your xapidata Twitter database (pooled)."""
+    return get_connection('twitter')
 
 # For backwards-compatibility
 create_connection = create_forum_connection
@@ -0,0 +1,108 @@
+"""
+Idempotent schema changes for the scraper databases.
+Run with `python -m database.migrations` after pulling a change that adds one.
+"""
+from database.connection import create_forum_connection, create_twitter_connection
+
+# (table, CREATE TABLE IF NOT EXISTS statement)
+TABLES = [
+    ('mention_rollup', """
+        CREATE TABLE IF NOT EXISTS mention_rollup (
+            bucket        DATE         NOT NULL,
+            source        VARCHAR(64)  NOT NULL,
+            source_detail VARCHAR(255) NOT NULL DEFAULT '',
+            category      VARCHAR(32)  NOT NULL,
+            mentions      INT UNSIGNED NOT NULL DEFAULT 0,
+            PRIMARY KEY (bucket, source, source_detail, category),
+            KEY idx_rollup_category_bucket (category, bucket)
+        );
+    """),
+]
+
+# (table, column, definition)
+COLUMNS = [
+    ('external_mentions', 'keyword_flags', 'BIGINT UNSIGNED NULL'),
+    ('external_mentions', 'topic_flags', 'INT UNSIGNED NULL'),
+]
+
+# (table, index name, definition)
+INDEXES = [
+    ('external_mentions', 'idx_post_date_flags', 'INDEX idx_post_date_flags (post_date, keyword_flags)'),
+    ('external_mentions', 'ft_content', 'FULLTEXT INDEX ft_content (content)'),
+    ('external_mentions', 'idx_source_detail_date', 'INDEX idx_source_detail_date (source, source_detail, post_date)'),
+]
+
+
+def table_exists(conn, table):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND table_name = %s;
+        """,
+        (table,)
+    )
+    found = cursor.fetchone() is not None
+    cursor.close()
+    return found
+
+
+def column_exists(conn, table, column):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s;
+        """,
+        (table, column)
+    )
+    found = cursor.fetchone() is not None
+    cursor.close()
+    return found
+
+
+def index_exists(conn, table, index):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s;
+        """,
+        (table, index)
+    )
+    found = cursor.fetchone() is not None
+    cursor.close()
+    return found
+
+
+def migrate(conn):
+    """Apply every missing table/column/index; returns the list of changes made."""
+    if getattr(conn, 'dialect', 'mysql') == 'sqlite':
+        # database/sqlite_backend creates the current schema when the file is opened
+        conn.ensure_schema()
+        return []
+    applied = []
+    cursor = conn.cursor()
+    for table, ddl in TABLES:
+        if not table_exists(conn, table):
+            cursor.execute(ddl)
+            applied.append(table)
+    for table, column, definition in COLUMNS:
+        if not column_exists(conn, table, column):
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition};")
+            applied.append(f"{table}.{column}")
+    for table, index, definition in INDEXES:
+        if not index_exists(conn, table, index):
+            cursor.execute(f"ALTER TABLE {table} ADD {definition};")
+            applied.append(f"{table}:{index}")
+    conn.commit()
+    cursor.close()
+    return applied
+
+
+if __name__ == "__main__":
+    for label, connect in (("forum", create_forum_connection), ("twitter", create_twitter_connection)):
+        conn = connect()
+        applied = migrate(conn)
+        print(f"[{label}] applied: {', '.join(applied) if applied else 'nothing (up to date)'}")
+        conn.close()
@@ -1,6 +1,11 @@
 import logging
 from datetime import datetime
 
+from database.rollup import update_rollup
+from utils.cleaning import keyword_flags
+from utils.dedupe import DigestSet, PackedDigests
+from utils.hash_index import HashIndex
+
 # Forum functions
 
 def get_last_scraped_page(conn, forum_name):
@@ -11,16 +16,16 @@ def get_last_scraped_page(conn, forum_name):
     return row[0] if row else None
 
 
+UPSERT_LAST_SCRAPED_SQL = """
+    INSERT INTO last_scraped (forum_name, last_page)
+    VALUES (%s, %s)
+    ON DUPLICATE KEY UPDATE last_page = %s;
+"""
+
+
 def update_last_scraped_page(conn, forum_name, last_page):
     cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT INTO last_scraped (forum_name, last_page)
-        VALUES (%s, %s)
-        ON DUPLICATE KEY UPDATE last_page = %s;
-        """,
-        (forum_name, last_page, last_page)
-    )
+    cursor.execute(UPSERT_LAST_SCRAPED_SQL, (forum_name, last_page, last_page))
     conn.commit()
     cursor.close()
 
@@ -36,19 +41,192 @@ def get_existing_hashes(conn, source_detail):
     return hashes
 
 
+def iter_existing_hashes(conn, source_detail, after_id=None, upto_id=None, chunk_size=10000):
+    """
+    Stream content hashes for a source in sorted order without building a list,
+    optionally restricted to rows with after_id < id <= upto_id.
+    """
+    query = "SELECT content_hash FROM external_mentions WHERE source_detail = %s"
+    params = [source_detail]
+    if after_id is not None:
+        query += " AND id > %s"
+        params.append(after_id)
+    if upto_id is not None:
+        query += " AND id <= %s"
+        params.append(upto_id)
+    cursor = conn.cursor()
+    cursor.execute(query + " ORDER BY content_hash;", params)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for row in rows:
+            if row[0]:
+                yield row[0]
+    cursor.close()
+
+
+def stream_chunks(conn, query, params=None, chunk_size=1000, dictionary=True):
+    """
+    Run `query` on an unbuffered cursor and yield its result in lists of up to
+    chunk_size rows, so only one chunk is held in memory however large the result.
+    The connection can't run other statements until the generator is exhausted or
+    closed; closing it early drains the remaining rows chunk by chunk.
+    """
+    cursor = conn.cursor(buffered=False, dictionary=dictionary)
+    try:
+        cursor.execute(query, params or ())
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        try:
+            while cursor.fetchmany(chunk_size):
+                pass
+        except Exception:
+            pass
+        cursor.close()
+
+
+def stream_rows(conn, query, params=None, chunk_size=1000, dictionary=True):
+    """Row-at-a-time view of stream_chunks."""
+    for rows in stream_chunks(conn, query, params, chunk_size, dictionary):
+        yield from rows
+
+
+def content_hash_exists(conn, content_hash):
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM external_mentions WHERE content_hash = %s LIMIT 1;", (content_hash,))
+    row = cursor.fetchone()
+    cursor.close()
+    return row is not None
+
+
+def get_max_mention_id(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT MAX(id) FROM external_mentions;")
+    row = cursor.fetchone()
+    cursor.close()
+    return (row[0] or 0) if row else 0
+
+
+def get_indexed_digests(conn, source_detail, index_dir='data/hash_index', max_segments=8, rescan_window=10000):
+    """
+    Dedupe set backed by the shared on-disk HashIndex: only rows near or above the
+    index watermark are read from MySQL, then all segments are mmapped, so startup
+    cost no longer grows with the table.
+
+    Parallel writers can commit a row after one with a higher id, which MAX(id) has
+    already moved the watermark past, so every sync re-reads the last rescan_window
+    ids below the watermark and indexes whatever digests are still missing.
+    """
+    index = HashIndex(index_dir, source_detail, max_segments)
+    with index.locked():
+        segments = index.open_segments()
+        watermark = index.watermark
+        top = get_max_mention_id(conn)
+        start = max(0, watermark - rescan_window)
+        if top > start:
+            fresh = PackedDigests.from_hashes(
+                iter_existing_hashes(conn, source_detail, after_id=start, upto_id=top)
+            )
+            missing = PackedDigests(b''.join(d for d in fresh if not any(d in s for s in segments)))
+            if len(missing) or top > watermark:
+                index.append(missing, max(top, watermark))
+                for s in segments:
+                    s.buf.close()
+                segments = index.open_segments()
+    return DigestSet(segments, confirm=lambda h: content_hash_exists(conn, h))
+
+
+INSERT_POST_SQL = """
+    INSERT IGNORE INTO external_mentions
+      (source, source_detail, external_id, username, post_date, content, mention_bot, content_hash,
+       keyword_flags, topic_flags)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def _with_flags(row, content_index):
+    """Append the (keyword_flags, topic_flags) tags computed from the row's content."""
+    return tuple(row) + keyword_flags(row[content_index])
+
+
+def _rollup_rows(rows):
+    """(source, source_detail, post_date, keyword_flags, topic_flags) for flagged post/tweet rows."""
+    return [(r[0], r[1], r[4], r[-2], r[-1]) for r in rows]
+
+
+# Unique keys the INSERTs dedupe on: column -> index in the post / tweet tuple
+POST_KEYS = {'content_hash': 7}
+TWEET_KEYS = {'tweet_id': 2, 'content_hash': 11}
+
+
+def _new_rows(cursor, rows, keys, chunk_size=500):
+    """
+    The rows of a batch that aren't stored yet, i.e. the ones the INSERT will add
+    rather than skip or update. Checked inside the caller's transaction just before
+    the insert, so only those rows are added to the rollup. A row repeating a key
+    seen earlier in the same batch doesn't count either.
+    """
+    seen = {}
+    for column, i in keys.items():
+        values = list({str(r[i]) for r in rows if r[i] is not None})
+        seen[column] = set()
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start:start + chunk_size]
+            cursor.execute(
+                f"SELECT {column} FROM external_mentions WHERE {column} IN ({', '.join(['%s'] * len(chunk))});",
+                chunk
+            )
+            seen[column].update(str(row[0]) for row in cursor.fetchall())
+
+    new = []
+    for r in rows:
+        values = [(column, str(r[i])) for column, i in keys.items() if r[i] is not None]
+        if any(v in seen[column] for column, v in values):
+            continue
+        for column, v in values:
+            seen[column].add(v)
+        new.append(r)
+    return new
+
+
 def insert_post(conn, data):
+    row = _with_flags(data, 5)
     cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT IGNORE INTO external_mentions 
-          (source, source_detail, external_id, username, post_date, content, mention_bot, content_hash)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
-        """,
-        data
-    )
+    new = _new_rows(cursor, [row], POST_KEYS)
+    cursor.execute(INSERT_POST_SQL, row)
+    update_rollup(cursor, _rollup_rows(new))
     conn.commit()
     cursor.close()
 
+
+def insert_posts(conn, posts, forum_name=None, last_page=None):
+    """
+    Insert a batch of post tuples (same shape as insert_post) with one multi-row
+    INSERT and a single commit. When forum_name/last_page are given, the
+    last_scraped checkpoint is written in the same transaction, so a page is
+    either fully stored and checkpointed or not at all.
+    """
+    cursor = conn.cursor()
+    try:
+        if posts:
+            rows = [_with_flags(p, 5) for p in posts]
+            new = _new_rows(cursor, rows, POST_KEYS)
+            cursor.executemany(INSERT_POST_SQL, rows)
+            update_rollup(cursor, _rollup_rows(new))
+        if forum_name is not None and last_page is not None:
+            cursor.execute(UPSERT_LAST_SCRAPED_SQL, (forum_name, last_page, last_page))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
 # Twitter functions
 
 def get_last_tweet_time(conn, source_detail):
@@ -59,25 +237,52 @@ def get_last_tweet_time(conn, source_detail):
     )
     row = cursor.fetchone()
     cursor.close()
-    return row[0] if row and row[0] else None
+    if not row or not row[0]:
+        return None
+    # MAX() over a DATETIME column comes back as text from SQLite
+    return datetime.fromisoformat(row[0]) if isinstance(row[0], str) else row[0]
+
+
+INSERT_TWEET_SQL = """
+    INSERT INTO external_mentions
+      (source, source_detail, tweet_id, content, post_date,
+       author_id, conversation_id, like_count, retweet_count, reply_count, quote_count, content_hash,
+       keyword_flags, topic_flags)
+    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+    ON DUPLICATE KEY UPDATE
+      content       = VALUES(content),
+      keyword_flags = VALUES(keyword_flags),
+      topic_flags   = VALUES(topic_flags),
+      like_count    = VALUES(like_count),
+      retweet_count = VALUES(retweet_count),
+      reply_count   = VALUES(reply_count),
+      quote_count   = VALUES(quote_count)
+"""
 
 
 def insert_tweet(conn, record):
+    row = _with_flags(record, 3)
     cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT INTO external_mentions
-          (source, source_detail, tweet_id, content, post_date,
-           author_id, conversation_id, like_count, retweet_count, reply_count, quote_count, content_hash)
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        ON DUPLICATE KEY UPDATE
-          content       = VALUES(content),
-          like_count    = VALUES(like_count),
-          retweet_count = VALUES(retweet_count),
-          reply_count   = VALUES(reply_count),
-          quote_count   = VALUES(quote_count);
-        """,
-        record
-    )
+    new = _new_rows(cursor, [row], TWEET_KEYS)
+    cursor.execute(INSERT_TWEET_SQL, row)
+    update_rollup(cursor, _rollup_rows(new))
     conn.commit()
     cursor.close()
+
+
+def insert_tweets(conn, records):
+    """Insert/refresh a batch of tweet records with one multi-row INSERT and a single commit."""
+    if not records:
+        return
+    cursor = conn.cursor()
+    try:
+        rows = [_with_flags(r, 3) for r in records]
+        new = _new_rows(cursor, rows, TWEET_KEYS)
+        cursor.executemany(INSERT_TWEET_SQL, rows)
+        update_rollup(cursor, _rollup_rows(new))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
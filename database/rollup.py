@@ -0,0 +1,77 @@
+"""
+Daily mention counts per (bucket, source, source_detail, category), so trend charts read
+O(days) rollup rows instead of scanning external_mentions.
+
+Categories: 'total' (every stored post), 'bot' (any BOT_KEYWORDS hit, keyword_flags > 0)
+and one per utils.keywords.TOPICS name.
+"""
+from collections import Counter
+
+from utils.keywords import TOPIC_BITS
+
+UPSERT_ROLLUP_SQL = """
+    INSERT INTO mention_rollup (bucket, source, source_detail, category, mentions)
+    VALUES (%s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE mentions = mentions + VALUES(mentions)
+"""
+
+
+def rollup_counts(rows):
+    """
+    Count (source, source_detail, post_date, keyword_flags, topic_flags) rows into
+    {(bucket, source, source_detail, category): n}.
+    """
+    counts = Counter()
+    for source, source_detail, post_date, kw_flags, topic_flags in rows:
+        bucket = str(post_date)[:10]
+        key = (bucket, source, source_detail or '')
+        counts[key + ('total',)] += 1
+        if kw_flags:
+            counts[key + ('bot',)] += 1
+        for topic, bit in TOPIC_BITS.items():
+            if topic_flags & bit:
+                counts[key + (topic,)] += 1
+    return counts
+
+
+def update_rollup(cursor, rows):
+    """
+    Add freshly inserted rows to the rollup inside the caller's transaction. Callers
+    pass only the rows the INSERT actually added (see queries._new_rows): duplicates
+    it skipped and tweets it only refreshed were counted when first stored.
+    `rebuild_rollup` corrects any drift, e.g. from edited tweets changing category.
+    """
+    counts = rollup_counts(rows)
+    if counts:
+        cursor.executemany(UPSERT_ROLLUP_SQL, [key + (n,) for key, n in counts.items()])
+
+
+def rebuild_rollup(conn, since=None):
+    """Recompute the rollup from external_mentions (all history, or buckets >= since)."""
+    categories = [('total', '1'), ('bot', 'keyword_flags > 0')]
+    categories += [(topic, f'(topic_flags & {bit}) <> 0') for topic, bit in TOPIC_BITS.items()]
+    where = "WHERE post_date >= %s" if since else ""
+    params = (since,) if since else ()
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"DELETE FROM mention_rollup {'WHERE bucket >= %s' if since else ''};", params)
+        for category, predicate in categories:
+            cursor.execute(
+                f"""
+                INSERT INTO mention_rollup (bucket, source, source_detail, category, mentions)
+                SELECT DATE(post_date), source, COALESCE(source_detail, ''), '{category}',
+                       SUM(CASE WHEN {predicate} THEN 1 ELSE 0 END)
+                FROM external_mentions
+                {where}
+                GROUP BY DATE(post_date), source, COALESCE(source_detail, '')
+                HAVING SUM(CASE WHEN {predicate} THEN 1 ELSE 0 END) > 0;
+                """,
+                params
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
@@ -0,0 +1,261 @@
+"""
+Embedded SQLite backend with the same schema as the MySQL databases.
+
+SQLiteConnection behaves like the mysql.connector connections the rest of the code
+uses (cursor(dictionary=..., buffered=...), %s placeholders, commit/rollback/close/ping)
+and rewrites the MySQL-only SQL in this repo on the fly (see translate()), so
+database/queries.py, rollup.py and the report run unchanged against a local file.
+Select it with "db_backend": "sqlite" in config.json (see database/connection.py).
+
+Requires SQLite >= 3.35 for ON CONFLICT ... DO UPDATE without a conflict target.
+"""
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS external_mentions (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        source          VARCHAR(64)  NOT NULL,
+        source_detail   VARCHAR(255),
+        external_id     VARCHAR(255),
+        tweet_id        VARCHAR(64),
+        username        VARCHAR(255),
+        author_id       VARCHAR(64),
+        conversation_id VARCHAR(64),
+        post_date       DATETIME,
+        content         TEXT,
+        mention_bot     BOOLEAN DEFAULT 0,
+        like_count      INTEGER DEFAULT 0,
+        retweet_count   INTEGER DEFAULT 0,
+        reply_count     INTEGER DEFAULT 0,
+        quote_count     INTEGER DEFAULT 0,
+        content_hash    CHAR(64),
+        keyword_flags   BIGINT UNSIGNED,
+        topic_flags     INT UNSIGNED
+    );
+    """,
+    # Unique keys INSERT IGNORE (posts) and ON DUPLICATE KEY UPDATE (tweets) rely on
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_content_hash ON external_mentions (content_hash);",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_tweet_id ON external_mentions (tweet_id);",
+    # Same secondary indexes as database/migrations.INDEXES (no FULLTEXT: see match_against)
+    "CREATE INDEX IF NOT EXISTS idx_post_date_flags ON external_mentions (post_date, keyword_flags);",
+    "CREATE INDEX IF NOT EXISTS idx_source_detail_date ON external_mentions (source, source_detail, post_date);",
+    """
+    CREATE TABLE IF NOT EXISTS last_scraped (
+        forum_name VARCHAR(255) PRIMARY KEY,
+        last_page  INT NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS mention_rollup (
+        bucket        DATE         NOT NULL,
+        source        VARCHAR(64)  NOT NULL,
+        source_detail VARCHAR(255) NOT NULL DEFAULT '',
+        category      VARCHAR(32)  NOT NULL,
+        mentions      INT UNSIGNED NOT NULL DEFAULT 0,
+        PRIMARY KEY (bucket, source, source_detail, category)
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_rollup_category_bucket ON mention_rollup (category, bucket);",
+]
+
+PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+]
+
+# ── Type mapping ───────────────────────────────────────────────────────────────
+# Store datetimes as 'YYYY-MM-DD HH:MM:SS' text (sorts and compares like MySQL's
+# DATETIME) and hand DATETIME/DATE columns back as datetime/date objects.
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(sep=' '))
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_converter("DATETIME", lambda b: datetime.fromisoformat(b.decode()))
+sqlite3.register_converter("DATE", lambda b: date.fromisoformat(b.decode()[:10]))
+
+# ── MySQL → SQLite dialect ─────────────────────────────────────────────────────
+_LITERAL = re.compile(r"('(?:[^']|'')*')")
+_DATE_FORMAT = re.compile(r"DATE_FORMAT\(\s*([^,()]+?)\s*,\s*'([^']*)'\s*\)", re.IGNORECASE)
+_CODE_RULES = [
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE), "INSERT OR IGNORE"),
+    (re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.IGNORECASE), "ON CONFLICT DO UPDATE SET"),
+    (re.compile(r"\bVALUES\((\w+)\)", re.IGNORECASE), r"excluded.\1"),
+    (re.compile(r"\bMATCH\s*\((\w+)\)\s*AGAINST\s*\(\s*\?\s+IN\s+BOOLEAN\s+MODE\s*\)", re.IGNORECASE),
+     r"match_against(\1, ?)"),
+    (re.compile(r"\bNOW\(\)", re.IGNORECASE), "CURRENT_TIMESTAMP"),
+]
+_FORMAT_CODES = {'%i': '%M', '%s': '%S', '%k': '%H'}
+
+
+def _strftime(m):
+    fmt = re.sub(r'%[isk]', lambda c: _FORMAT_CODES[c.group(0)], m.group(2))
+    return f"strftime('{fmt}', {m.group(1)})"
+
+
+@lru_cache(maxsize=256)
+def translate(sql):
+    """Rewrite the MySQL constructs used in this repo to SQLite; string literals are left alone."""
+    sql = _DATE_FORMAT.sub(_strftime, sql)
+    parts = _LITERAL.split(sql)
+    for i in range(0, len(parts), 2):
+        code = parts[i].replace('%s', '?')
+        for pattern, replacement in _CODE_RULES:
+            code = pattern.sub(replacement, code)
+        parts[i] = code
+    return ''.join(parts)
+
+
+_BOOLEAN_TERM = re.compile(r'([+-]?)(?:"([^"]*)"|(\S+))')
+
+
+def match_against(content, query):
+    """
+    Scan-based stand-in for MATCH(...) AGAINST (... IN BOOLEAN MODE): +term is required,
+    -term excluded, other terms/"phrases" optional (at least one must hit), term* is a prefix.
+    Returns the number of matched terms, so it can be used as a relevance score.
+    """
+    if not content or not query:
+        return 0
+    required, excluded, optional = [], [], []
+    for op, phrase, word in _BOOLEAN_TERM.findall(query):
+        term = phrase if phrase else word
+        if not term.strip():
+            continue
+        if term.endswith('*'):
+            pattern = re.compile(r'\b' + re.escape(term[:-1]), re.IGNORECASE)
+        else:
+            pattern = re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE)
+        {'+': required, '-': excluded}.get(op, optional).append(pattern)
+
+    if any(p.search(content) for p in excluded):
+        return 0
+    if not all(p.search(content) for p in required):
+        return 0
+    hits = sum(1 for p in optional if p.search(content))
+    if optional and not required and not hits:
+        return 0
+    return len(required) + hits
+
+
+# ── DB-API wrappers ────────────────────────────────────────────────────────────
+class SQLiteCursor:
+    """mysql.connector-style cursor: %s placeholders, optional dict rows."""
+
+    def __init__(self, raw, dictionary=False):
+        self._cursor = raw.cursor()
+        self._dictionary = dictionary
+
+    def execute(self, operation, params=None):
+        self._cursor.execute(translate(operation), tuple(params or ()))
+
+    def executemany(self, operation, seq_params):
+        self._cursor.executemany(translate(operation), [tuple(p) for p in seq_params])
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip((d[0] for d in self._cursor.description), row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(r) for r in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(r) for r in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return (self._row(r) for r in self._cursor)
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def with_rows(self):
+        return self._cursor.description is not None
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    dialect = 'sqlite'
+
+    def __init__(self, path):
+        if sqlite3.sqlite_version_info < (3, 35, 0):
+            raise RuntimeError(f"SQLite >= 3.35 required, found {sqlite3.sqlite_version}")
+        uri = path.startswith('file:')
+        self._raw = sqlite3.connect(path, uri=uri, detect_types=sqlite3.PARSE_DECLTYPES,
+                                    check_same_thread=False, timeout=30)
+        self._raw.create_function('match_against', 2, match_against, deterministic=True)
+        for pragma in PRAGMAS:
+            self._raw.execute(pragma)
+
+    def cursor(self, buffered=None, dictionary=False, **kwargs):
+        # sqlite3 cursors already step through results lazily, so buffered=False
+        # (database.queries.stream_chunks) streams without extra work
+        return SQLiteCursor(self._raw, dictionary)
+
+    def ensure_schema(self):
+        for ddl in SCHEMA:
+            self._raw.execute(ddl)
+        self._raw.commit()
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def close(self):
+        self._raw.close()
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        pass
+
+    def is_connected(self):
+        return True
+
+
+_schema_ready = set()
+_memory_anchors = {}
+_lock = threading.Lock()
+
+
+def connect(path):
+    """
+    Open `path` (created with the full schema on first use). ':memory:' and
+    'memory:<name>' give a named in-memory database shared by every connection in
+    the process, for tests and benchmarks.
+    """
+    if path == ':memory:' or path.startswith('memory:'):
+        name = path[len('memory:'):] if path.startswith('memory:') else 'default'
+        path = f"file:{name}?mode=memory&cache=shared"
+        with _lock:
+            if path not in _memory_anchors:
+                # keeps the in-memory database alive between connections
+                _memory_anchors[path] = SQLiteConnection(path)
+    elif os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = SQLiteConnection(path)
+    with _lock:
+        if path not in _schema_ready:
+            conn.ensure_schema()
+            _schema_ready.add(path)
+    return conn
@@ -1,24 +1,76 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
 from scrapers.forum_scraper import scrape_forum
 from scrapers.twitter_scraper import fetch_and_store_tweets
 from scrapers.reddit_scraper import fetch_and_store_reddit_posts
-import subprocess
 
-def run_scrapers():
-    print("📡 Running forum scraper...")
-    scrape_forum()
-    print("🐦 Running Twitter scraper...")
-    fetch_and_store_tweets()
-    print("👽 Running Reddit scraper...")
-    fetch_and_store_reddit_posts()
+def run_scrapers(timings=None):
+    timings = {} if timings is None else timings
+    for label, name, fn in (("📡 Running forum scraper...", 'forum', scrape_forum),
+                            ("🐦 Running Twitter scraper...", 'twitter', fetch_and_store_tweets),
+                            ("👽 Running Reddit scraper...", 'reddit', fetch_and_store_reddit_posts)):
+        print(label)
+        start = time.perf_counter()
+        fn()
+        timings[name] = time.perf_counter() - start
+    return timings
 
-def generate_report():
+def generate_report(env=None):
     print("📝 Generating HTML report...")
+    # Under --record/--replay the report runs through the harness so its DeepSeek call is captured too
+    cmd = ["python", "Report_Sumarization.py"]
+    if env:
+        cmd = [sys.executable, "-m", "benchmarks.http_replay", "exec", "Report_Sumarization.py"]
     try:
-        subprocess.run(["python", "Report_Sumarization.py"], check=True)
+        subprocess.run(cmd, check=True, env={**os.environ, **env} if env else None)
         print("✅ Report successfully generated at docs/index.html")
     except subprocess.CalledProcessError as e:
         print(f"❌ Report generation failed: {e}")
 
+def parse_args(argv=None):
+    from benchmarks.http_replay import parse_latency
+    parser = argparse.ArgumentParser(description="Run all scrapers, then build the report")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--record', metavar='DIR', help="save every HTTP response to a cassette directory")
+    mode.add_argument('--replay', metavar='DIR', help="serve HTTP from a cassette directory (no network)")
+    parser.add_argument('--latency-ms', type=parse_latency, default=(0, 0),
+                        help="replay latency per response, e.g. 50 or 20,80")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of replayed responses that fail")
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--seed', type=int, help="seed for replay latency/error draws")
+    parser.add_argument('--skip-report', action='store_true')
+    parser.add_argument('--profile', metavar='FILE', help="write cProfile stats for the scraper stage")
+    return parser.parse_args(argv)
+
+def run(args):
+    timings = {}
+    if args.profile:
+        import cProfile
+        cProfile.runctx("run_scrapers(timings)", globals(), {'timings': timings}, args.profile)
+        print(f"🔬 Profile written to {args.profile}")
+    else:
+        run_scrapers(timings)
+    print("⏱️ " + ", ".join(f"{name}: {seconds:.1f}s" for name, seconds in timings.items()))
+    return timings
+
 if __name__ == "__main__":
-    run_scrapers()
-    generate_report()
+    args = parse_args()
+    if args.record or args.replay:
+        from benchmarks.http_replay import ENV_MODE, ENV_TARGET, http_replay
+        mode = 'record' if args.record else 'replay'
+        with http_replay(mode, args.record or args.replay, args.latency_ms,
+                         args.error_rate, args.error_status, args.seed) as server:
+            run(args)
+            if not args.skip_report:
+                target = server.url if server else args.record
+                generate_report({ENV_MODE: mode, ENV_TARGET: target})
+            if server:
+                print(f"🔁 Replay server: {server.stats}")
+    else:
+        run(args)
+        if not args.skip_report:
+            generate_report()
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from collections import deque
+from contextlib import ExitStack
+from urllib.parse import urlsplit
+
+from utils.rate_limit import TokenBucket
+
+
+class AsyncPageFetcher:
+    """
+    Fetches numbered forum pages concurrently while handing them back in page order.
+
+    `fetch` is a blocking function url -> html|None (e.g. forum_scraper.get_html); it is
+    run in worker threads. At most `max_in_flight` requests are open per host, and every
+    request first takes a token from `bucket` so a forum never exceeds its rate limit.
+    `global_limit` is an optional threading semaphore shared by fetchers in other threads
+    to cap total in-flight requests across all forums. `host_limits` maps host -> threading
+    semaphore, shared the same way, so forums on one host together stay within its limit.
+    """
+
+    def __init__(self, fetch, bucket, max_in_flight=4, global_limit=None, host_limits=None):
+        self.fetch = fetch
+        self.bucket = bucket
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.global_limit = global_limit
+        self.host_limits = host_limits or {}
+        self._host_limits = {}
+
+    def _host_semaphore(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_in_flight)
+        return self._host_limits[host]
+
+    async def get(self, url):
+        async with self._host_semaphore(url):
+            await self.bucket.acquire_async()
+            return await asyncio.to_thread(self._fetch_limited, url)
+
+    def _fetch_limited(self, url):
+        # Always host before global, so fetchers in other threads can't deadlock on the pair
+        with ExitStack() as limits:
+            host_limit = self.host_limits.get(urlsplit(url).netloc)
+            if host_limit is not None:
+                limits.enter_context(host_limit)
+            if self.global_limit is not None:
+                limits.enter_context(self.global_limit)
+            return self.fetch(url)
+
+    async def iter_pages(self, base_url, start_page):
+        """
+        Yield (page, html) for start_page, start_page + 1, ... in order, keeping up to
+        `max_in_flight` pages prefetched. Stop consuming (and aclose()) to cancel the rest.
+        """
+        pending = deque()
+        page = start_page
+        try:
+            while True:
+                while len(pending) < self.max_in_flight:
+                    url = base_url.format(page)
+                    pending.append((page, asyncio.ensure_future(self.get(url))))
+                    page += 1
+                current, task = pending.popleft()
+                yield current, await task
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+
+def _forum_settings(forum, defaults):
+    """Per-forum settings override the global `fetcher` config."""
+    settings = dict(defaults or {})
+    settings.update({k: forum[k] for k in ('requests_per_second', 'burst', 'max_in_flight_per_host') if k in forum})
+    return settings
+
+
+def make_host_limits(forums, defaults=None):
+    """
+    One threading.BoundedSemaphore per host for fetchers running in parallel threads.
+    Forums sharing a host share its semaphore, sized by the smallest
+    max_in_flight_per_host among them.
+    """
+    sizes = {}
+    for forum in forums:
+        host = urlsplit(forum['base_url']).netloc
+        size = max(1, int(_forum_settings(forum, defaults).get('max_in_flight_per_host', 4)))
+        sizes[host] = min(sizes.get(host, size), size)
+    return {host: threading.BoundedSemaphore(size) for host, size in sizes.items()}
+
+
+def make_fetcher(fetch, forum, defaults=None, global_limit=None, host_limits=None):
+    """Build a fetcher for one forum; per-forum settings override the global `fetcher` config."""
+    settings = _forum_settings(forum, defaults)
+    bucket = TokenBucket(settings.get('requests_per_second', 1.0), settings.get('burst', 1))
+    return AsyncPageFetcher(fetch, bucket, settings.get('max_in_flight_per_host', 4), global_limit, host_limits)
@@ -1,20 +1,15 @@
 import requests
-import time
 import logging
 import sys
 import json
-from bs4 import BeautifulSoup
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
-from database.connection import create_connection
-from database.queries import (
-    get_last_scraped_page,
-    update_last_scraped_page,
-    get_existing_hashes,
-    insert_post
-)
-from utils.cleaning import clean_text, clean_date, contains_bot_mention
-from utils.hashing import generate_hash
+from database.connection import BACKEND, create_connection, pool_size
+from database.queries import get_last_scraped_page, get_indexed_digests
+from scrapers.fetcher import make_fetcher, make_host_limits
+from scrapers.pipeline import run_forum_pipeline
 
 # ── Logging setup: file + console ─────────────────────────────────────────────
 logger = logging.getLogger()
@@ -49,99 +44,67 @@ def get_html(url):
         logging.error(f"Error fetching {url}: {e}")
         return None
 
-def parse_page(html, forum_name, page_number, existing_hashes):
+# ── Main scraping routine ──────────────────────────────────────────────────────
+def forum_name(forum):
+    """Forum entries may use either 'name' or the older 'forum_name' key."""
+    return forum.get('name') or forum['forum_name']
+
+
+def scrape_one_forum(forum, pool, global_limit=None, position=0, host_limits=None):
     """
-    Parse a forum page’s HTML, return list of valid new posts:
-    (source, source_detail, external_id, username, post_date, content, mention_bot, content_hash)
+    Crawl one forum from its checkpoint until a missing page or a page with no new posts.
+    Each forum gets its own connection, rate limit and checkpoint so it can run alongside others.
     """
-    soup = BeautifulSoup(html, 'html.parser')
-    posts = []
-
-    import re
-    post_containers = soup.find_all('div', id=lambda x: x and re.fullmatch(r"post\d+", x))
-    for post in post_containers:
-
-        pid = post.get("id")
-        # Skip placeholders/invalid IDs
-        if not pid or "post_message_" in pid:
-            logging.info(f"Skipping invalid post id: {pid}")
-            continue
-
-        # Username
-        user_tag = post.find('a', class_='h2')
-        if not user_tag:
-            logging.info(f"Skipping {pid}: missing username")
-            continue
-        user = user_tag.text.strip()
-
-        # Content
-        msg_div = post.find('div', class_='post__message')
-        if not msg_div:
-            logging.info(f"Skipping {pid}: missing content div")
-            continue
-        content = clean_text(msg_div.text)
-        if not content:
-            logging.info(f"Skipping {pid}: empty content")
-            continue
-
-        # Date
-        date_div = post.find('div', class_='caption--small')
-        date_text = date_div.get_text(strip=True) if date_div else ''
-        pd = clean_date(date_text)
-        if pd == "0000-00-00 00:00:00":
-            logging.info(f"Skipping {pid}: invalid date '{date_text}'")
-            continue
-
-        # Bot flag & hash
-        bot_flag = contains_bot_mention(content)
-        chash = generate_hash(forum_name, pid, user, pd, content)
-        if chash in existing_hashes:
-            logging.info(f"Skipping duplicate post: {pid}")
-            continue
-
-        posts.append(("2+2 Forum", forum_name, pid, user, pd, content, bot_flag, chash))
-
-    return posts
-
-# ── Main scraping routine ──────────────────────────────────────────────────────
-def scrape_forum():
+    name = forum_name(forum)
     conn = create_connection()
-
-    for forum in config['forums']:
-        name = forum['name']
-        existing = get_existing_hashes(conn, name)
+    try:
+        existing = get_indexed_digests(conn, name, **config.get('hash_index', {}))
         last = get_last_scraped_page(conn, name)
         page = last + 1 if last else forum['start_page']
 
         logging.info(f"Starting {name} at page {page}")
         print(f"[{name}] Starting at page {page}", flush=True)
 
-        with tqdm(desc=f"Scraping {name}", unit="page") as bar:
-            while True:
-                url = forum['base_url'].format(page)
-                html = get_html(url)
-                if html is None:
-                    logging.info(f"[{name}][Page {page}] No HTML; stopping.")
-                    print(f"[{name}][Page {page}] No HTML; stopping.", flush=True)
-                    break
-
-                new_posts = parse_page(html, name, page, existing)
-                if not new_posts:
-                    logging.info(f"[{name}][Page {page}] 0 new posts; stopping.")
-                    print(f"[{name}][Page {page}] 0 new posts; stopping.", flush=True)
-                    break
-
-                for p in new_posts:
-                    insert_post(conn, p)
-                    existing.add(p[-1])
-
-                update_last_scraped_page(conn, name, page)
-                logging.info(f"[{name}][Page {page}] Inserted {len(new_posts)} posts")
-                page += 1
-                bar.update(1)
-                time.sleep(1)
-
-    conn.close()
+        pipeline_cfg = config.get('pipeline', {})
+        fetcher = make_fetcher(get_html, forum, config.get('fetcher'), global_limit, host_limits)
+        with tqdm(desc=f"Scraping {name}", unit="page", position=position) as bar:
+            return run_forum_pipeline(
+                conn, name, forum['base_url'], page, existing, fetcher, pool,
+                backend_name=forum.get('parser_backend', config.get('parser_backend', 'bs4')),
+                queue_size=pipeline_cfg.get('queue_size', 8),
+                on_page=lambda page, count: bar.update(1),
+            )
+    finally:
+        conn.close()
+
+
+def scrape_forum():
+    """Crawl all configured forums in parallel; one forum failing does not stop the others."""
+    forums = config['forums']
+    fetcher_cfg = config.get('fetcher', {})
+    workers = config.get('pipeline', {}).get('parse_workers')
+    max_forums = fetcher_cfg.get('max_parallel_forums', len(forums)) or 1
+    if BACKEND == 'mysql':
+        # Each crawl holds a pooled connection until it finishes: never run more than the pool has
+        max_forums = min(max_forums, pool_size('forum'))
+    global_limit = threading.BoundedSemaphore(fetcher_cfg.get('max_in_flight_total', 8))
+    # Shared across forum threads: all 2+2 forums live on one host and share its limit
+    host_limits = make_host_limits(forums, fetcher_cfg)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            ThreadPoolExecutor(max_workers=max_forums, thread_name_prefix="forum") as crawlers:
+        futures = {
+            crawlers.submit(scrape_one_forum, forum, pool, global_limit, i, host_limits): forum_name(forum)
+            for i, forum in enumerate(forums)
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                pages = future.result()
+                logging.info(f"[{name}] Finished: {pages} pages stored")
+            except Exception as e:
+                logging.error(f"[{name}] Crawl failed: {e}")
+                print(f"[{name}] Crawl failed: {e}", flush=True)
 
 # ── Entry point ────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
@@ -0,0 +1,151 @@
+import logging
+import re
+
+from bs4 import BeautifulSoup
+
+from utils.cleaning import clean_text, clean_date, contains_bot_mention
+from utils.hashing import generate_hash
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:
+    etree = lxml_html = None
+
+POST_ID_RE = re.compile(r"^post\d+$")
+
+# ── Parser backends ────────────────────────────────────────────────────────────
+# Each backend yields one (post_id, username, raw_content, date_text) tuple per post
+# container. username/raw_content are None when the element is missing, date_text is
+# '' when the date element is missing. All cleaning happens in parse_page(), so every
+# backend produces identical post tuples.
+
+class SoupBackend:
+    """Reference implementation on BeautifulSoup's html.parser."""
+    name = 'bs4'
+
+    def extract(self, html):
+        soup = BeautifulSoup(html, 'html.parser')
+        for post in soup.find_all('div', id=POST_ID_RE):
+            user_tag = post.find('a', class_='h2')
+            msg_div = post.find('div', class_='post__message')
+            date_div = post.find('div', class_='caption--small')
+            yield (
+                post.get("id"),
+                user_tag.text.strip() if user_tag else None,
+                msg_div.text if msg_div else None,
+                date_div.get_text(strip=True) if date_div else '',
+            )
+
+
+def _has_class(name):
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+class LxmlBackend:
+    """libxml2 parse + precompiled XPath; several times faster than html.parser."""
+    name = 'lxml'
+
+    def __init__(self):
+        if lxml_html is None:
+            raise ImportError("lxml is not installed")
+        self.posts = etree.XPath('//div[starts-with(@id, "post")]')
+        self.user = etree.XPath(f'(.//a[{_has_class("h2")}])[1]')
+        self.message = etree.XPath(f'(.//div[{_has_class("post__message")}])[1]')
+        self.date = etree.XPath(f'(.//div[{_has_class("caption--small")}])[1]')
+        # bs4's get_text() skips <script>/<style> contents; match it so content and
+        # content_hash don't depend on the backend
+        self.texts = etree.XPath('.//text()[not(ancestor::script or ancestor::style)]')
+
+    def _text(self, el):
+        return ''.join(self.texts(el))
+
+    def _first(self, xpath, el):
+        found = xpath(el)
+        return found[0] if found else None
+
+    def extract(self, html):
+        if not html.strip():
+            return
+        doc = lxml_html.fromstring(html)
+        for post in self.posts(doc):
+            pid = post.get("id")
+            if not POST_ID_RE.match(pid):
+                continue
+            user_tag = self._first(self.user, post)
+            msg_div = self._first(self.message, post)
+            date_div = self._first(self.date, post)
+            yield (
+                pid,
+                self._text(user_tag).strip() if user_tag is not None else None,
+                self._text(msg_div) if msg_div is not None else None,
+                ''.join(t.strip() for t in self.texts(date_div)) if date_div is not None else '',
+            )
+
+
+BACKENDS = {b.name: b for b in (SoupBackend, LxmlBackend)}
+_instances = {}
+
+
+def get_backend(name='bs4'):
+    """Return a shared backend instance, falling back to bs4 if `name` is unavailable."""
+    if name not in _instances:
+        try:
+            _instances[name] = BACKENDS[name]()
+        except (KeyError, ImportError) as e:
+            if name == 'bs4':
+                raise
+            logging.warning(f"Parser backend '{name}' unavailable ({e!r}); using bs4")
+            _instances[name] = get_backend('bs4')
+    return _instances[name]
+
+
+# ── Page parsing ───────────────────────────────────────────────────────────────
+def parse_page(html, forum_name, page_number, existing_hashes, backend=None):
+    """
+    Parse a forum page’s HTML, return list of valid new posts:
+    (source, source_detail, external_id, username, post_date, content, mention_bot, content_hash)
+    """
+    backend = backend or get_backend()
+    posts = []
+
+    for pid, user, raw_content, date_text in backend.extract(html):
+        # Skip placeholders/invalid IDs
+        if not pid or "post_message_" in pid:
+            logging.info(f"Skipping invalid post id: {pid}")
+            continue
+
+        # Username
+        if user is None:
+            logging.info(f"Skipping {pid}: missing username")
+            continue
+
+        # Content
+        if raw_content is None:
+            logging.info(f"Skipping {pid}: missing content div")
+            continue
+        content = clean_text(raw_content)
+        if not content:
+            logging.info(f"Skipping {pid}: empty content")
+            continue
+
+        # Date
+        pd = clean_date(date_text)
+        if pd == "0000-00-00 00:00:00":
+            logging.info(f"Skipping {pid}: invalid date '{date_text}'")
+            continue
+
+        # Bot flag & hash
+        bot_flag = contains_bot_mention(content)
+        chash = generate_hash(forum_name, pid, user, pd, content)
+        if chash in existing_hashes:
+            logging.info(f"Skipping duplicate post: {pid}")
+            continue
+
+        posts.append(("2+2 Forum", forum_name, pid, user, pd, content, bot_flag, chash))
+
+    return posts
+
+
+def parse_page_with(html, forum_name, page_number, backend_name='bs4'):
+    """Process-pool entry point: parse with a backend looked up by name, without dedupe."""
+    return parse_page(html, forum_name, page_number, (), get_backend(backend_name))
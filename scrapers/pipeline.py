@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import queue
+import threading
+
+from database.queries import insert_posts
+from scrapers.parsers import parse_page_with
+
+_DONE = object()
+
+
+def _put(q, item, stop):
+    """Blocking put that gives up once `stop` is set, so producers never hang on a full queue."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _fetch_stage(fetcher, base_url, start_page, html_q, stop):
+    """I/O stage: fetch pages in order with the async fetcher and hand them on."""
+    async def run():
+        pages = fetcher.iter_pages(base_url, start_page)
+        try:
+            async for page, html in pages:
+                if not _put(html_q, (page, html), stop) or html is None:
+                    break
+        finally:
+            await pages.aclose()
+
+    try:
+        asyncio.run(run())
+    except Exception as e:
+        logging.error(f"Fetch stage failed: {e}")
+    finally:
+        _put(html_q, _DONE, stop)
+
+
+def _parse_stage(pool, forum_name, backend_name, html_q, parsed_q, stop):
+    """
+    CPU stage: submit each page to the process pool; futures are queued in page order.
+    If submitting fails (e.g. a broken or shut-down pool) the exception is queued for
+    the writer to re-raise; _DONE is always queued last so the writer never blocks.
+    """
+    try:
+        while not stop.is_set():
+            try:
+                item = html_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                break
+            page, html = item
+            future = pool.submit(parse_page_with, html, forum_name, page, backend_name) if html is not None else None
+            if not _put(parsed_q, (page, future), stop) or future is None:
+                break
+    except Exception as e:
+        logging.error(f"Parse stage failed: {e}")
+        _put(parsed_q, e, stop)
+    finally:
+        _put(parsed_q, _DONE, stop)
+
+
+def run_forum_pipeline(conn, name, base_url, start_page, existing, fetcher, pool,
+                       backend_name='bs4', queue_size=8, on_page=None):
+    """
+    Crawl one forum as three overlapping stages connected by bounded queues:
+    fetch (threads/asyncio) -> parse + clean + hash (process pool) -> DB writer (this thread).
+
+    The writer consumes pages strictly in order and stops at the first missing page or page
+    with no new posts, committing each page's posts together with its last_scraped
+    checkpoint, so checkpoint semantics match the serial scraper. Full queues block the
+    upstream stage, which bounds memory when the writer or the parser falls behind.
+    Returns the number of pages stored.
+    """
+    html_q = queue.Queue(maxsize=queue_size)
+    parsed_q = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    stages = [
+        threading.Thread(target=_fetch_stage, args=(fetcher, base_url, start_page, html_q, stop),
+                         name=f"fetch-{name}", daemon=True),
+        threading.Thread(target=_parse_stage, args=(pool, name, backend_name, html_q, parsed_q, stop),
+                         name=f"parse-{name}", daemon=True),
+    ]
+    for t in stages:
+        t.start()
+
+    stored = 0
+    try:
+        while True:
+            item = parsed_q.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            page, future = item
+            if future is None:
+                logging.info(f"[{name}][Page {page}] No HTML; stopping.")
+                print(f"[{name}][Page {page}] No HTML; stopping.", flush=True)
+                break
+
+            # Dedupe here rather than in the workers: the digest set stays in this process
+            new_posts = [p for p in future.result() if p[-1] not in existing]
+            if not new_posts:
+                logging.info(f"[{name}][Page {page}] 0 new posts; stopping.")
+                print(f"[{name}][Page {page}] 0 new posts; stopping.", flush=True)
+                break
+
+            # Posts and checkpoint are committed together in one transaction
+            insert_posts(conn, new_posts, name, page)
+            existing.update(p[-1] for p in new_posts)
+            stored += 1
+            logging.info(f"[{name}][Page {page}] Inserted {len(new_posts)} posts")
+            if on_page:
+                on_page(page, len(new_posts))
+    finally:
+        stop.set()
+        for t in stages:
+            t.join()
+        # Drop anything still queued so pending parse jobs don't outlive the crawl
+        while not parsed_q.empty():
+            item = parsed_q.get_nowait()
+            if isinstance(item, tuple) and item[1] is not None:
+                item[1].cancel()
+
+    return stored
@@ -3,12 +3,12 @@ import json
 import logging
 from datetime import datetime, timedelta
 from tqdm import tqdm
-import re
 
 from database.connection import create_connection
-from database.queries import get_existing_hashes, insert_post
+from database.queries import get_indexed_digests, insert_posts
 from utils.cleaning import clean_text
 from utils.hashing import generate_hash
+from utils.matching import get_matcher
 
 # ── Logging setup ──────────────────────────────────────
 logger = logging.getLogger(__name__)
@@ -20,6 +20,7 @@ with open("config.json") as f:
 
 reddit_cfg = config["reddit"]
 DAYS_BACK = 60
+BATCH_SIZE = 100
 SUBREDDITS = ["poker", "onlinepoker"]
 
 BRANDS = [
@@ -32,8 +33,7 @@ RISKS = [
 # ── Matching functions ─────────────────────────────────
 def match_terms(text, terms):
     """Return all keywords from `terms` found in text as full words"""
-    text = text.lower()
-    return [term for term in terms if re.search(rf"\b{re.escape(term)}\b", text)]
+    return get_matcher(terms).matches(text)
 
 # ── Main Reddit scraper ────────────────────────────────
 def fetch_and_store_reddit_posts():
@@ -46,7 +46,6 @@ def fetch_and_store_reddit_posts():
     )
 
     conn = create_connection()
-    existing_hashes = get_existing_hashes(conn, "Reddit")
     total_inserted = 0
 
     cutoff_time = datetime.utcnow() - timedelta(days=DAYS_BACK)
@@ -54,6 +53,9 @@ def fetch_and_store_reddit_posts():
     for sub_name in SUBREDDITS:
         logger.info(f"📡 Reading r/{sub_name}...")
         subreddit = reddit.subreddit(sub_name)
+        # Posts are stored with source_detail "r/<sub>", so that's what the index is keyed by
+        existing_hashes = get_indexed_digests(conn, f"r/{sub_name}", **config.get("hash_index", {}))
+        batch = []
 
         with tqdm(desc=f"r/{sub_name}", unit="post") as bar:
             for post in subreddit.new(limit=500):
@@ -86,11 +88,18 @@ def fetch_and_store_reddit_posts():
                     post_hash              # hash
                 )
 
-                insert_post(conn, post_tuple)
+                batch.append(post_tuple)
                 existing_hashes.add(post_hash)
-                total_inserted += 1
+                if len(batch) >= BATCH_SIZE:
+                    insert_posts(conn, batch)
+                    total_inserted += len(batch)
+                    batch = []
                 bar.update(1)
 
+        if batch:
+            insert_posts(conn, batch)
+            total_inserted += len(batch)
+
     conn.close()
     logger.info(f"✅ Finished Reddit scrape: {total_inserted} new posts inserted.")
 
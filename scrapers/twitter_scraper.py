@@ -1,5 +1,4 @@
 import json
-import re
 import time
 import logging
 from datetime import datetime, timedelta
@@ -7,8 +6,9 @@ from tqdm import tqdm
 import tweepy
 
 from database.connection import create_twitter_connection
-from database.queries import get_last_tweet_time, get_existing_hashes, insert_tweet
+from database.queries import get_last_tweet_time, get_indexed_digests, insert_tweets
 from utils.hashing import generate_hash
+from utils.matching import KeywordMatcher
 
 # ── Logging to console + file ──────────────────────────────────────────────────
 logger = logging.getLogger()
@@ -33,14 +33,15 @@ BEARER_TOKEN  = cfg['twitter']['bearer_token']
 QUERY         = cfg['twitter']['query']
 SOURCE        = 'X'
 SOURCE_DETAIL = 'ACR_POKER'
+BATCH_SIZE    = 500
 
-# ── Issue-keywords regex ───────────────────────────────────────────────────────
+# ── Issue-keywords matcher ─────────────────────────────────────────────────────
 ISSUE_KEYWORDS = [
-    r"\bbug\b", r"\berror\b", r"\bissue\b",
-    r"\bdeposit\b", r"\brefund\b",
-    r"\bdown\b", r"\b(bot|bots)\b"
+    "bug", "error", "issue",
+    "deposit", "refund",
+    "down", "bot", "bots"
 ]
-ISSUE_REGEX = re.compile("|".join(ISSUE_KEYWORDS), re.IGNORECASE)
+ISSUE_MATCHER = KeywordMatcher(ISSUE_KEYWORDS)
 
 # ── Tweepy client ─────────────────────────────────────────────────────────────
 client = tweepy.Client(bearer_token=BEARER_TOKEN, wait_on_rate_limit=True)
@@ -49,7 +50,7 @@ client = tweepy.Client(bearer_token=BEARER_TOKEN, wait_on_rate_limit=True)
 def fetch_and_store_tweets():
     logger.info("Starting Twitter scraper")
     conn = create_twitter_connection()
-    existing = get_existing_hashes(conn, SOURCE_DETAIL)
+    existing = get_indexed_digests(conn, SOURCE_DETAIL, **cfg.get('hash_index', {}))
     last_time = get_last_tweet_time(conn, SOURCE_DETAIL)
 
     # determine start_time (no earlier than 7 days ago)
@@ -86,10 +87,11 @@ def fetch_and_store_tweets():
             break
 
     inserted = 0
+    batch = []
     for t in tqdm(tweets, desc="Filtering tweets", unit="tw"):
         text = t.text
         # post-filter by issue keywords
-        if not ISSUE_REGEX.search(text):
+        if not ISSUE_MATCHER.search(text):
             continue
 
         # skip if no author_id
@@ -118,9 +120,16 @@ def fetch_and_store_tweets():
             t.public_metrics.get("quote_count", 0),
             ch
         )
-        insert_tweet(conn, record)
+        batch.append(record)
         existing.add(ch)
-        inserted += 1
+        if len(batch) >= BATCH_SIZE:
+            insert_tweets(conn, batch)
+            inserted += len(batch)
+            batch = []
+
+    if batch:
+        insert_tweets(conn, batch)
+        inserted += len(batch)
 
     conn.close()
     logger.info(f"Inserted {inserted} new tweets.")
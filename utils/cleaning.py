@@ -2,8 +2,11 @@ import re
 from datetime import datetime
 import logging
 
+from utils.keywords import BOT_KEYWORD_MATCHER, KEYWORD_BITS, TOPIC_MATCHER, TOPIC_BITS
+from utils.matching import KeywordMatcher
 
-BOT_REGEX = re.compile(r"\b(bot|botting|bots|cheating bot|poker bot|AI bot|GTO bot)\b", re.IGNORECASE)
+BOT_TERMS = ["bot", "botting", "bots", "cheating bot", "poker bot", "AI bot", "GTO bot"]
+BOT_MATCHER = KeywordMatcher(BOT_TERMS)
 
 def clean_text(text):
     text = text.replace("\n", " ").replace("\r", " ").strip()
@@ -51,4 +54,20 @@ def clean_date(date_text):
 
 
 def contains_bot_mention(content):
-    return int(bool(BOT_REGEX.search(content)))
+    return int(BOT_MATCHER.search(content))
+
+
+def keyword_flags(content):
+    """
+    Return (keyword_flags, topic_flags) bitmasks for content, stored with each row so
+    reports can filter on integers instead of LIKE scans. See utils/keywords.py for bits.
+    """
+    if not content:
+        return 0, 0
+    kw = 0
+    for hit in BOT_KEYWORD_MATCHER.finditer(content):
+        kw |= KEYWORD_BITS[hit.term]
+    topics = 0
+    for topic in TOPIC_MATCHER.matched_groups(content):
+        topics |= TOPIC_BITS[topic]
+    return kw, topics
@@ -0,0 +1,84 @@
+from bisect import bisect_left
+
+DIGEST_SIZE = 16  # bytes of the sha256 content_hash kept per row
+
+
+def to_digest(content_hash):
+    """Pack the leading 128 bits of a hex content_hash into 16 raw bytes."""
+    return bytes.fromhex(content_hash[:DIGEST_SIZE * 2])
+
+
+class PackedDigests:
+    """
+    Read-only sorted sequence of fixed-width digests stored back to back in one buffer
+    (bytes, bytearray or mmap). Costs 16 bytes per hash instead of a ~100 byte str object.
+    """
+
+    def __init__(self, buf):
+        if len(buf) % DIGEST_SIZE:
+            raise ValueError("buffer length is not a multiple of the digest size")
+        self.buf = buf
+
+    def __len__(self):
+        return len(self.buf) // DIGEST_SIZE
+
+    def __getitem__(self, i):
+        start = i * DIGEST_SIZE
+        return self.buf[start:start + DIGEST_SIZE]
+
+    def __iter__(self):
+        for start in range(0, len(self.buf), DIGEST_SIZE):
+            yield self.buf[start:start + DIGEST_SIZE]
+
+    def __contains__(self, digest):
+        i = bisect_left(self, digest)
+        return i < len(self) and self[i] == digest
+
+    @classmethod
+    def from_hashes(cls, hashes):
+        """Pack hex hashes; sorted input (e.g. ORDER BY content_hash) is packed without a copy."""
+        buf = bytearray()
+        prev = b''
+        in_order = True
+        for h in hashes:
+            d = to_digest(h)
+            in_order = in_order and d >= prev
+            prev = d
+            buf += d
+        if not in_order:
+            packed = cls(buf)
+            buf = bytearray(b''.join(sorted(packed[i] for i in range(len(packed)))))
+        return cls(bytes(buf))
+
+
+class DigestSet:
+    """
+    Compact stand-in for the set of existing content hashes.
+
+    Membership is checked against packed 128-bit digest segments, so a hit can in
+    principle be a false positive (probability ~ n / 2**128). If `confirm` is given,
+    every segment hit is confirmed with it (typically a DB lookup) before it counts.
+    Hashes added during the run are kept exactly and need no confirmation.
+    """
+
+    def __init__(self, segments=(), confirm=None):
+        self.segments = list(segments)
+        self.confirm = confirm
+        self._recent = set()
+
+    def __len__(self):
+        return sum(len(s) for s in self.segments) + len(self._recent)
+
+    def __contains__(self, content_hash):
+        if content_hash in self._recent:
+            return True
+        digest = to_digest(content_hash)
+        if not any(digest in s for s in self.segments):
+            return False
+        return self.confirm(content_hash) if self.confirm else True
+
+    def add(self, content_hash):
+        self._recent.add(content_hash)
+
+    def update(self, hashes):
+        self._recent.update(hashes)
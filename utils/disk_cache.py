@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+import time
+
+
+def make_key(*parts):
+    """Stable content-addressed key for any JSON-serialisable parts."""
+    blob = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+class DiskCache:
+    """
+    Small on-disk key/value cache: one JSON file per key, written atomically.
+
+    Entries older than `ttl` seconds are treated as missing. Reads refresh an entry's
+    mtime, so prune() can evict least-recently-used entries until the directory is
+    under `max_bytes`. By default prune() runs after every set(); caches that write
+    many entries per run can pass prune_on_set=False and call prune() once at the end.
+    """
+
+    def __init__(self, directory, ttl=None, max_bytes=None, prune_on_set=True):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.prune_on_set = prune_on_set
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return default
+        if self.ttl is not None and time.time() - entry.get('created', 0) > self.ttl:
+            self._remove(path)
+            return default
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry['value']
+
+    def set(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf8') as f:
+            json.dump({'created': time.time(), 'value': value}, f)
+        os.replace(tmp, path)
+        if self.prune_on_set:
+            self.prune()
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def prune(self):
+        """Drop expired entries, then least-recently-used ones until under max_bytes."""
+        entries = []
+        now = time.time()
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in sorted(entries):
+            expired = self.ttl is not None and now - mtime > self.ttl
+            if not expired and (self.max_bytes is None or total <= self.max_bytes):
+                continue
+            self._remove(path)
+            total -= size
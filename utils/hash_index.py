@@ -0,0 +1,112 @@
+import heapq
+import json
+import mmap
+import os
+import re
+from contextlib import contextmanager
+
+from utils.dedupe import PackedDigests
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-writer only
+    fcntl = None
+
+
+class HashIndex:
+    """
+    On-disk content-hash index for one source_detail.
+
+    The index is a directory of immutable segment files, each a sorted run of 16-byte
+    digests, plus manifest.json listing the live segments and the external_mentions id
+    watermark they cover. Readers mmap the segments read-only; writers take an exclusive
+    file lock, write a new segment and swap the manifest atomically, so any number of
+    scraper processes can share one index. Once more than `max_segments` exist they are
+    merged into one.
+    """
+
+    def __init__(self, root, source_detail, max_segments=8):
+        slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', source_detail)
+        self.path = os.path.join(root, slug)
+        self.max_segments = max_segments
+        os.makedirs(self.path, exist_ok=True)
+
+    # ── manifest ──────────────────────────────────────────────────────────────
+    def _manifest_path(self):
+        return os.path.join(self.path, 'manifest.json')
+
+    def read_manifest(self):
+        try:
+            with open(self._manifest_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'watermark': 0, 'segments': [], 'next': 0}
+
+    def _write_atomic(self, name, data):
+        tmp = os.path.join(self.path, f".{name}.{os.getpid()}.tmp")
+        with open(tmp, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.path, name))
+
+    @property
+    def watermark(self):
+        return self.read_manifest()['watermark']
+
+    @contextmanager
+    def locked(self):
+        """Exclusive writer lock shared by all processes using this index."""
+        with open(os.path.join(self.path, 'lock'), 'a') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    # ── readers ───────────────────────────────────────────────────────────────
+    def open_segments(self):
+        """mmap every live segment read-only and return them as PackedDigests."""
+        segments = []
+        for name in self.read_manifest()['segments']:
+            with open(os.path.join(self.path, name), 'rb') as f:
+                segments.append(PackedDigests(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)))
+        return segments
+
+    # ── writers (call inside locked()) ────────────────────────────────────────
+    def append(self, packed, watermark):
+        """Add a sorted PackedDigests run covering rows up to `watermark`."""
+        manifest = self.read_manifest()
+        if len(packed):
+            name = f"seg-{manifest['next']:06d}.bin"
+            self._write_atomic(name, bytes(packed.buf))
+            manifest['segments'].append(name)
+            manifest['next'] += 1
+        manifest['watermark'] = max(manifest['watermark'], watermark)
+        self._write_atomic('manifest.json', json.dumps(manifest).encode())
+        if len(manifest['segments']) > self.max_segments:
+            self.compact()
+
+    def compact(self):
+        """Merge all segments into one. Old files are unlinked; open mmaps stay valid."""
+        manifest = self.read_manifest()
+        old = manifest['segments']
+        if len(old) < 2:
+            return
+        runs = self.open_segments()
+        merged = bytearray()
+        prev = None
+        for digest in heapq.merge(*runs):
+            if digest != prev:
+                merged += digest
+                prev = digest
+        name = f"seg-{manifest['next']:06d}.bin"
+        self._write_atomic(name, bytes(merged))
+        manifest.update(segments=[name], next=manifest['next'] + 1)
+        self._write_atomic('manifest.json', json.dumps(manifest).encode())
+        for r in runs:
+            r.buf.close()
+        for name in old:
+            os.remove(os.path.join(self.path, name))
@@ -0,0 +1,28 @@
+from html import escape
+
+from utils.keywords import BOT_KEYWORD_MATCHER
+
+
+def highlight(text, matcher=BOT_KEYWORD_MATCHER, css_class='highlight-bot'):
+    """
+    Escape `text` for HTML and wrap every keyword hit in <span class="css_class">.
+    Matching runs on the raw text, so escaping can't create or break matches.
+    Returns (html, unique_matches) with matches lower-cased, in order of first appearance.
+    """
+    parts = []
+    found = {}
+    pos = 0
+    for hit in matcher.spans(text):
+        parts.append(escape(text[pos:hit.start]))
+        parts.append(f'<span class="{css_class}">{escape(text[hit.start:hit.end])}</span>')
+        found.setdefault(hit.term, None)
+        pos = hit.end
+    parts.append(escape(text[pos:]))
+    return ''.join(parts), list(found)
+
+
+def highlight_rows(rows, field='content', matcher=BOT_KEYWORD_MATCHER, css_class='highlight-bot'):
+    """Yield (row, html, unique_matches) for a batch of rows using one compiled matcher."""
+    for r in rows:
+        html, matches = highlight(r[field] or '', matcher, css_class)
+        yield r, html, matches
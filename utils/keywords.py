@@ -0,0 +1,31 @@
+from utils.matching import KeywordMatcher
+
+# Bot/security keywords tracked by the report (whole-word matches).
+# A keyword's position is its bit in external_mentions.keyword_flags and a topic's
+# position is its bit in topic_flags: only ever append to these lists.
+BOT_KEYWORDS = [
+    "bot", "bots", "botting", "automated", "automation",
+    "cheat", "cheats", "cheating", "cheater", "cheaters",
+    "collu", "collusion", "colluder", "colluders",
+    "security", "secure", "hack", "hacks", "hacking", "hacker",
+    "exploit", "exploiting", "exploiter", "vulnerability"
+]
+
+# Report topic buckets (substring matches, e.g. "collu" also hits "colluding")
+TOPICS = {
+    "bots": ["bot", "automated", "automation"],
+    "cheating": ["cheat", "exploit"],
+    "collusion": ["collu"],
+    "security": ["security", "secure", "hack", "vulnerability"],
+    "gambling": ["gamble", "gambling", "wager"],
+    "tournaments": ["tournament", "event", "venom", "mtt", "game"],
+    "financial": ["deposit", "money", "fund", "payment", "dollar", "$"],
+    "accounts": ["account", "login", "password", "username"]
+}
+
+BOT_KEYWORD_MATCHER = KeywordMatcher(BOT_KEYWORDS)
+TOPIC_MATCHER = KeywordMatcher.from_groups(TOPICS, whole_word=False)
+
+KEYWORD_BITS = {kw: 1 << i for i, kw in enumerate(BOT_KEYWORDS)}
+TOPIC_BITS = {topic: 1 << i for i, topic in enumerate(TOPICS)}
+
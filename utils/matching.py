@@ -0,0 +1,175 @@
+import re
+from collections import deque, namedtuple
+from functools import lru_cache
+
+Hit = namedtuple('Hit', 'term start end')
+
+
+def _is_word(ch):
+    """Same word-character rule as re's \\b on str patterns."""
+    return ch.isalnum() or ch == '_'
+
+
+def _at_boundary(text, i):
+    before = i > 0 and _is_word(text[i - 1])
+    after = i < len(text) and _is_word(text[i])
+    return before != after
+
+
+def _fold(text):
+    """Lower-case text without changing its length, so offsets map back to the original."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(ch.lower()[:1] for ch in text)
+
+
+def _build_trie(terms):
+    """goto[state] maps a character to the next state; terminal[state] is the term ending there."""
+    goto, terminal = [{}], [None]
+    for term in terms:
+        state = 0
+        for ch in term:
+            nxt = goto[state].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto.append({})
+                terminal.append(None)
+                goto[state][ch] = nxt
+            state = nxt
+        terminal[state] = term
+    return goto, terminal
+
+
+def _build_automaton(goto, terminal):
+    """
+    Aho-Corasick failure links over the trie, flattened into a dense transition table:
+    step[state](ch, 0) is the next state with failure links already followed, and
+    outputs[state] lists the (term, length) pairs that end there.
+    """
+    fail = [0] * len(goto)
+    outputs = [((t, len(t)),) if t else () for t in terminal]
+    # Breadth-first, so a state's failure target is always complete before the state
+    delta = [None] * len(goto)
+    delta[0] = dict(goto[0])
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        delta[state] = {**delta[fail[state]], **goto[state]}
+        for ch, nxt in goto[state].items():
+            fail[nxt] = delta[fail[state]].get(ch, 0)
+            outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+            queue.append(nxt)
+    return [d.get for d in delta], outputs
+
+
+class KeywordMatcher:
+    """
+    Finds every occurrence of a keyword list in one pass over the text.
+
+    Terms are compiled into a trie over lower-cased text, so the work per post depends
+    on the text, not on how many terms there are: CPU per post stays flat as keyword
+    lists grow, only the tables get bigger. Overlapping hits ("poker bot" and "bot",
+    "acr" and "acr poker") are all reported.
+
+    With whole_word=True a hit must start and end on a word boundary (the same rule as
+    re's \\b), so the trie is only walked from word starts whose first character can
+    begin a term; a C-level regex finds those. With whole_word=False terms match
+    anywhere (substring semantics, like the old report topic patterns) and every
+    character goes through an Aho-Corasick automaton built on the same trie.
+
+    Terms can be tagged with groups (see from_groups) to answer "which topics/categories
+    does this text hit" from the same scan.
+    """
+
+    def __init__(self, terms, whole_word=True, groups=None):
+        self.terms = [t for t in dict.fromkeys(t.lower() for t in terms) if t]
+        self.whole_word = whole_word
+        self.groups = groups or {}
+        self._goto, self._terminal = _build_trie(self.terms)
+        if whole_word:
+            first = ''.join(re.escape(ch) for ch in self._goto[0])
+            self._starts = re.compile(rf'\b[{first}]') if first else None
+        else:
+            self._step, self._outputs = _build_automaton(self._goto, self._terminal)
+        self._longest = max(map(len, self.terms), default=0)
+        self._order = {t: i for i, t in enumerate(self.terms)}
+
+    @classmethod
+    def from_groups(cls, groups, whole_word=True):
+        """Build from {group: [terms]}; a term may belong to several groups."""
+        term_groups = {}
+        for group, terms in groups.items():
+            for t in terms:
+                term_groups.setdefault(t.lower(), []).append(group)
+        return cls(list(term_groups), whole_word, term_groups)
+
+    def _scan(self, text):
+        return self._scan_words(text) if self.whole_word else self._scan_substrings(text)
+
+    def _scan_words(self, text):
+        """Yield whole-word hits, ordered by start offset (shortest first)."""
+        if self._starts is None:
+            return
+        goto, terminal = self._goto, self._terminal
+        folded = _fold(text)
+        for m in self._starts.finditer(folded):
+            start = end = m.start()
+            state = 0
+            for ch in folded[start:start + self._longest]:
+                state = goto[state].get(ch)
+                if state is None:
+                    break
+                end += 1
+                if terminal[state] is not None and _at_boundary(text, end):
+                    yield Hit(terminal[state], start, end)
+
+    def _scan_substrings(self, text):
+        """Yield every hit, ordered by end offset."""
+        step, outputs = self._step, self._outputs
+        state = 0
+        for end, ch in enumerate(_fold(text), 1):
+            state = step[state](ch, 0)
+            for term, length in outputs[state]:
+                yield Hit(term, end - length, end)
+
+    def finditer(self, text):
+        """Yield Hit(term, start, end) for every occurrence, ordered by start offset (longest first)."""
+        return iter(sorted(self._scan(text), key=lambda h: (h.start, -h.end)))
+
+    def find_all(self, text):
+        return list(self.finditer(text))
+
+    def spans(self, text):
+        """
+        Non-overlapping hits for highlighting: leftmost first, longest at each start
+        ("poker bot" wins over "bot" inside it).
+        """
+        end = 0
+        for hit in self.finditer(text):
+            if hit.start < end:
+                continue
+            end = hit.end
+            yield hit
+
+    def search(self, text):
+        return next(self._scan(text), None) is not None
+
+    def matches(self, text):
+        """Unique matched terms, in the order of the original term list."""
+        found = {h.term for h in self._scan(text)}
+        return sorted(found, key=lambda t: self._order.get(t, len(self._order)))
+
+    def matched_groups(self, text):
+        """Set of groups with at least one term present in text."""
+        return {g for h in self._scan(text) for g in self.groups.get(h.term, ())}
+
+
+@lru_cache(maxsize=64)
+def _cached_matcher(terms, whole_word):
+    return KeywordMatcher(terms, whole_word)
+
+
+def get_matcher(terms, whole_word=True):
+    """Shared compiled matcher for an ad-hoc term list."""
+    return _cached_matcher(tuple(terms), whole_word)
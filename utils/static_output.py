@@ -0,0 +1,82 @@
+import glob
+import gzip
+import hashlib
+import json
+import os
+import time
+
+try:
+    import brotli
+except ImportError:  # optional: only .gz siblings are written without it
+    brotli = None
+
+
+def write_atomic(path, data, precompress=()):
+    """
+    Write `data` (str or bytes) to a temp file in the same directory and rename it over
+    `path`, so readers never see a partial file. `precompress` may contain 'gzip' and/or
+    'br' to also write path.gz / path.br siblings for static servers that serve them.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    outputs = [(path, data)]
+    if 'gzip' in precompress:
+        outputs.append((path + '.gz', gzip.compress(data, compresslevel=9, mtime=0)))
+    if 'br' in precompress and brotli is not None:
+        outputs.append((path + '.br', brotli.compress(data)))
+
+    for target, blob in outputs:
+        tmp = f"{target}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp, target)
+    return [target for target, _ in outputs]
+
+
+def write_shards(root, shards, precompress=()):
+    """
+    Write {relative_name: payload} as JSON files under `root`, content-addressed as
+    name.<hash>.json so browsers can cache them forever and a page never mixes shards
+    from two runs. Returns {relative_name: file path relative to root}.
+    """
+    written = {}
+    for name, payload in shards.items():
+        blob = json.dumps(payload, separators=(',', ':'), default=str, ensure_ascii=False).encode('utf-8')
+        digest = hashlib.sha256(blob).hexdigest()[:12]
+        rel = f"{name}.{digest}.json"
+        path = os.path.join(root, rel)
+        if not os.path.exists(path):
+            write_atomic(path, blob, precompress)
+        written[name] = rel.replace(os.sep, '/')
+    return written
+
+
+def remove_stale_shards(root, keep):
+    """Delete shard files (and their .gz/.br siblings) under `root` not listed in `keep`."""
+    keep = {os.path.normpath(os.path.join(root, rel)) for rel in keep}
+    removed = 0
+    for dirpath, _, files in os.walk(root, topdown=False):
+        for name in files:
+            path = os.path.join(dirpath, name)
+            base = path[:-3] if path.endswith(('.gz', '.br')) else path
+            if base.endswith('.json') and os.path.normpath(base) not in keep:
+                os.remove(path)
+                removed += 1
+        if dirpath != root and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return removed
+
+
+def prune_snapshots(pattern, keep=5, max_age_days=None):
+    """Keep the `keep` newest files matching `pattern` and drop any older than max_age_days."""
+    paths = sorted(glob.glob(pattern), key=os.path.getmtime, reverse=True)
+    cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+    removed = []
+    for i, path in enumerate(paths):
+        if i >= keep or (cutoff is not None and os.path.getmtime(path) < cutoff):
+            os.remove(path)
+            removed.append(path)
+    return removed